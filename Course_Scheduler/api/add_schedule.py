@@ -1,65 +1,118 @@
+import random
+import time
 from fastapi import APIRouter, HTTPException
-from models.schema import ScheduleRequest, ScheduleResponse
+from models.schema import ScheduleRequest, ScheduleResponse, AddManyRequest, AddManyResponse
 from firebase.firebase_client import get_firestore_client
-from utils.parser import (
-    load_course_csv,
-    parse_timeslot,
-    is_overlapping,
-    get_random_course_row
-)
-from uuid import uuid4  # ✅ 각 강의에 고유 ID 부여용
+from common.metrics import timed
+from utils.timemask import overlaps
+from utils.course_index import get_course_index, TIMETABLE_UNDECIDED
+from utils.schedule_cache import schedule_cache
+from utils.timetable_docs import build_lecture
 
 router = APIRouter()
 db = get_firestore_client()
-df = load_course_csv()
+CONFLICT_DETAIL = "이미 해당 시간에 다른 일정이 있어요!"
 
 @router.post("/schedule/add", response_model=ScheduleResponse)
 def add_schedule(request: ScheduleRequest):
+    started = time.monotonic()
     user_id = request.user_id
     subject = request.과목명
     professor = request.교수명
 
-    # ✅ [NEW] 찜한 강의인지 확인
-    favorites_ref = db.collection("users").document(user_id).collection("favorites")
-    favorites = [doc.to_dict() for doc in favorites_ref.stream()]
-    is_favorited = any(
-        fav.get("과목명") == subject and fav.get("교수명") == professor for fav in favorites
-    )
-    if not is_favorited:
+    # ✅ [NEW] 찜한 강의인지 확인 (캐시에 없으면 방금 찜했을 수 있으니 찜 목록만 다시 읽음)
+    schedule = schedule_cache.get(user_id)
+    if not schedule.is_favorite(subject, professor):
+        schedule = schedule_cache.refresh_favorites(user_id, since=started)
+    if not schedule.is_favorite(subject, professor):
         raise HTTPException(status_code=403, detail="⛔ 해당 강의는 찜한 강의가 아닙니다.")
 
-    
-    selected_row, is_divided = get_random_course_row(df, subject, professor)
-    if selected_row is None:
+    # 분반 조회 (시간표는 로드할 때 미리 파싱됨)
+    section, is_divided = get_course_index().pick(subject, professor)
+    if section is None:
         raise HTTPException(status_code=404, detail="해당 강의 정보를 찾을 수 없습니다.")
 
-    timetable_str = selected_row['시간표']
-    if timetable_str.strip() == '미정':
+    if section.problem == TIMETABLE_UNDECIDED:
         raise HTTPException(status_code=400, detail="아직 시간표가 존재하지 않는 강의예요!")
-    
-    parsed_time = parse_timeslot(timetable_str)
-    if not parsed_time:
+    if section.problem is not None:
         raise HTTPException(status_code=400, detail="시간표 형식이 잘못되었습니다.")
 
-    # ✅ 현재 시간표 불러와서 중복 확인
     timetable_ref = db.collection("users").document(user_id).collection("timetable")
-    existing = [doc.to_dict() for doc in timetable_ref.stream()]
+    with schedule.lock:
+        # ✅ 현재 시간표 전체 점유 비트마스크(캐시)와 AND 한 번으로 겹침 확인
+        if overlaps(section.mask, schedule.mask):
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
 
-    # '시간표' 키가 존재하는 문서만 추출
-    existing_times = [lec["시간표"] for lec in existing if "시간표" in lec]
+        # ✅ (교과목명, 교수명, 분반)으로 만든 고정 id 문서로 저장
+        lecture_id, new_lecture = build_lecture(section, is_divided)
 
-    if is_overlapping(parsed_time, existing_times):
-        raise HTTPException(status_code=409, detail="이미 해당 시간에 다른 일정이 있어요!")
-
-    # ✅ 고유 lecture_id 생성 및 개별 문서로 저장
-    lecture_id = str(uuid4())
-    new_lecture = {
-        "과목명": subject + "(분반)" if is_divided else subject,
-        "교수명": professor,
-        "시간표": parsed_time,
-        "캠퍼스": selected_row['캠퍼스']
-    }
-    
-    timetable_ref.document(lecture_id).set(new_lecture)
+        try:
+            with timed("firestore_write"):
+                timetable_ref.document(lecture_id).set(new_lecture)
+        except Exception:
+            schedule_cache.invalidate(user_id)
+            raise
+        schedule.add(lecture_id, dict(new_lecture))
 
     return {"message": "✅ 강의가 시간표에 추가되었습니다.", "data": new_lecture}
+
+
+# 여러 강의 한 번에 추가: 모두 확인한 뒤 배치 쓰기 하나로 저장 (하나라도 안 되면 아무것도 저장하지 않음)
+@router.post("/schedule/add-many", response_model=AddManyResponse)
+def add_many_schedule(request: AddManyRequest):
+    started = time.monotonic()
+    user_id = request.user_id
+    keys = list(dict.fromkeys((lec.과목명, lec.교수명) for lec in request.lectures))
+
+    schedule = schedule_cache.get(user_id)
+    if not all(schedule.is_favorite(*key) for key in keys):
+        schedule = schedule_cache.refresh_favorites(user_id, since=started)
+
+    index = get_course_index()
+    timetable_ref = db.collection("users").document(user_id).collection("timetable")
+    with schedule.lock:
+        errors, added = [], []
+        mask = schedule.mask
+        for subject, professor in keys:
+            error = None
+            sections = index.lookup(subject, professor)
+            usable = [s for s in sections if s.problem is None]
+            if not schedule.is_favorite(subject, professor):
+                error = "찜한 강의가 아닙니다."
+            elif not sections:
+                error = "강의 정보를 찾을 수 없습니다."
+            elif not usable:
+                error = "아직 시간표가 존재하지 않는 강의예요!"
+            else:
+                # 분반은 무작위 순서로 보되, 앞에서 고른 강의/기존 시간표와 겹치지 않는 것
+                random.shuffle(usable)
+                section = next((s for s in usable if not overlaps(s.mask, mask)), None)
+                if section is None:
+                    error = CONFLICT_DETAIL
+                else:
+                    mask |= section.mask
+                    added.append(build_lecture(section, len(sections) > 1))
+            if error:
+                errors.append({"과목명": subject, "교수명": professor, "사유": error})
+
+        if errors:
+            # 시간이 겹치는 것만 문제면 409, 그 외(찜 안 함/강의 없음/시간표 미정)가 섞이면 400
+            status = 409 if all(e["사유"] == CONFLICT_DETAIL for e in errors) else 400
+            raise HTTPException(status_code=status, detail={
+                "message": "추가할 수 없는 강의가 있어 아무것도 저장하지 않았습니다.",
+                "errors": errors
+            })
+
+        try:
+            with timed("firestore_write"):
+                batch = db.batch()
+                for lecture_id, lecture in added:
+                    batch.set(timetable_ref.document(lecture_id), lecture)
+                batch.commit()
+        except Exception:
+            schedule_cache.invalidate(user_id)
+            raise
+        for lecture_id, lecture in added:
+            schedule.add(lecture_id, dict(lecture))
+
+    return {"message": f"✅ 강의 {len(added)}개가 시간표에 추가되었습니다.", "data": [lecture for _, lecture in added]}
@@ -0,0 +1,66 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Query
+from utils.course_index import get_course_index
+from utils.schedule_cache import schedule_cache
+from utils.timemask import free_slots, to_mask
+from utils.timetable_docs import DIVIDED_SUFFIX
+
+router = APIRouter()
+
+# 수업이 열리는 범위 (월~토 1~12교시) 안의 빈 시간만 보여줌
+OPEN_HOURS = to_mask({day: range(1, 13) for day in ('월', '화', '수', '목', '금', '토')})
+
+
+def _section_info(section):
+    return {
+        "과목명": section.subject,
+        "교수명": section.professor,
+        "분반": section.division,
+        "시간표": section.slots,
+        "캠퍼스": section.campus
+    }
+
+
+def _taken_courses(schedule):
+    # 이미 시간표에 있는 강의 (다른 분반도 다시 권하지 않음)
+    taken = set()
+    for lecture in schedule.lectures():
+        subject = lecture.get("교과목명") or lecture.get("과목명", "")
+        if subject.endswith(DIVIDED_SUFFIX):
+            subject = subject[:-len(DIVIDED_SUFFIX)]
+        taken.add((subject, lecture.get("교수명")))
+    return taken
+
+
+@router.get("/schedule/{user_id}/compatible")
+def compatible_sections(
+    user_id: str,
+    scope: Literal["favorites", "catalog"] = "favorites",
+    campus: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=3000)
+):
+    """현재 시간표와 겹치지 않는 찜한 강의(또는 전체 카탈로그) 분반.
+    시간표 점유 비트마스크(캐시)로 겹치는 분반 비트셋을 만들어 뒤집기만 하므로 후보마다 Firestore를 읽지 않음"""
+    schedule = schedule_cache.get(user_id)
+    index = get_course_index()
+    fits = index.compatible(schedule.mask)
+    taken = _taken_courses(schedule)
+
+    if scope == "favorites":
+        candidates = [
+            section
+            for key in schedule.favorites if key not in taken
+            for section in index.lookup(*key) if fits >> section.position & 1
+        ]
+    else:
+        candidates = [s for s in index.sections_in(fits) if (s.subject, s.professor) not in taken]
+    if campus:
+        candidates = [s for s in candidates if s.campus == campus]
+
+    return {
+        "message": "🧩 지금 시간표에 넣을 수 있는 강의입니다." if candidates else "지금 시간표에 넣을 수 있는 강의가 없습니다.",
+        "scope": scope,
+        "count": len(candidates),
+        "free": free_slots(schedule.mask, OPEN_HOURS),
+        "sections": [_section_info(s) for s in candidates[:limit]]
+    }
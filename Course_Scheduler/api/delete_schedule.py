@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from models.schema import ScheduleRequest, BaseResponse
 from firebase.firebase_client import get_firestore_client
+from common.metrics import timed
+from utils.schedule_cache import schedule_cache
 
 router = APIRouter()
 db = get_firestore_client()
@@ -12,18 +14,18 @@ def delete_schedule(request: ScheduleRequest):
     professor = request.교수명
 
     timetable_ref = db.collection("users").document(user_id).collection("timetable")
-    docs = timetable_ref.stream()
+    schedule = schedule_cache.get(user_id)
+    with schedule.lock:
+        target_doc_id, _ = schedule.find(subject, professor)
+        if not target_doc_id:
+            raise HTTPException(status_code=404, detail="해당 강의는 시간표에 없습니다.")
 
-    target_doc_id = None
-    for doc in docs:
-        data = doc.to_dict()
-        if subject in data.get("과목명", "") and data.get("교수명") == professor:
-            target_doc_id = doc.id
-            break
-
-    if not target_doc_id:
-        raise HTTPException(status_code=404, detail="해당 강의는 시간표에 없습니다.")
-
-    timetable_ref.document(target_doc_id).delete()
+        try:
+            with timed("firestore_write"):
+                timetable_ref.document(target_doc_id).delete()
+        except Exception:
+            schedule_cache.invalidate(user_id)
+            raise
+        schedule.remove(target_doc_id)
 
     return {"message": "🗑️ 강의가 삭제되었습니다."}
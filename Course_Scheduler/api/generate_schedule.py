@@ -0,0 +1,68 @@
+import time
+from fastapi import APIRouter
+from models.schema import GenerateRequest
+from utils.course_index import get_course_index
+from utils.generator import CourseOptions, distinct_sections, generate_timetables
+from utils.schedule_cache import schedule_cache
+from utils.timemask import from_mask, merge
+
+router = APIRouter()
+
+
+@router.post("/schedule/generate")
+def generate_schedule(request: GenerateRequest):
+    started = time.perf_counter()
+    requested_at = time.monotonic()             # 캐시의 favorites_read_at과 같은 시계
+    user_id = request.user_id
+
+    # 찜 목록은 앱에서 자주 바뀌므로 새로 읽고, 현재 시간표 점유 비트마스크는 캐시 사용
+    schedule = schedule_cache.refresh_favorites(user_id, since=requested_at)
+    favorites = list(schedule.favorites.values())
+    base_mask = schedule.mask if request.keep_existing else 0
+
+    # 찜한 강의마다 카탈로그의 모든 분반 펼치기 (같은 강의를 여러 번 찜했으면 한 번만)
+    index = get_course_index()
+    courses, unavailable, seen = [], [], set()
+    for favorite in favorites:
+        key = (favorite.get("과목명"), favorite.get("교수명"))
+        if key in seen:
+            continue
+        seen.add(key)
+        sections = index.lookup(*key)
+        options = distinct_sections(sections, base_mask)
+        if options:
+            courses.append(CourseOptions(key, options))
+        else:
+            reason = ("강의 정보 없음" if not sections
+                      else "시간표 미정" if all(s.problem is not None for s in sections)
+                      else "현재 시간표와 겹침")
+            unavailable.append({"과목명": key[0], "교수명": key[1], "사유": reason})
+
+    ranked, complete = generate_timetables(
+        courses, base_mask, request.top_n, request.time_budget_ms / 1000
+    )
+
+    timetables = []
+    for chosen in ranked:
+        lectures = [{
+            "과목명": course.key[0],
+            "교수명": course.key[1],
+            "분반": section.division,
+            "시간표": section.slots,
+            "캠퍼스": section.campus
+        } for course, section in chosen]
+        timetables.append({
+            "lectures": lectures,
+            "coverage": len(lectures),
+            "campuses": sorted({lec["캠퍼스"] for lec in lectures if lec["캠퍼스"]}),
+            "시간표": from_mask(merge(*(section.mask for _, section in chosen)))
+        })
+
+    return {
+        "message": "🧩 겹치지 않는 시간표 조합입니다." if timetables else "만들 수 있는 시간표 조합이 없습니다.",
+        "favorites": len(seen),
+        "timetables": timetables,
+        "unavailable": unavailable,
+        "complete": complete,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
@@ -1,21 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from fastapi import APIRouter, HTTPException
-from models.schema import UserOnlyRequest, BaseResponse
+from models.schema import ResetRequest, ResetResponse
 from firebase.firebase_client import get_firestore_client
+from common.metrics import timed
+from utils.schedule_cache import schedule_cache
+from utils.timetable_docs import BATCH_WRITE_LIMIT
 
 router = APIRouter()
 db = get_firestore_client()
 
-@router.post("/schedule/reset", response_model=BaseResponse)
-def reset_schedule(request: UserOnlyRequest):
-    user_id = request.user_id
+# 배치 커밋을 다음 페이지 읽기와 겹쳐서 보내기 위한 스레드 풀
+RESET_COMMIT_WORKERS = 4
+commit_pool = ThreadPoolExecutor(max_workers=RESET_COMMIT_WORKERS)
+
+
+def _pages(timetable_ref):
+    """시간표 문서 참조를 500개씩 (필드는 읽지 않고 id만, 문서 id 순 커서로 페이지 나눔)"""
+    query = timetable_ref.select([]).limit(BATCH_WRITE_LIMIT)
+    last = None
+    while True:
+        with timed("firestore_read"):
+            page = list((query.start_after(last) if last is not None else query).stream())
+        if page:
+            yield page
+        if len(page) < BATCH_WRITE_LIMIT:
+            return
+        last = page[-1]
+
+
+def _delete_page(page):
+    with timed("firestore_write"):
+        batch = db.batch()
+        for doc in page:
+            batch.delete(doc.reference)
+        batch.commit()
+    return len(page)
 
+
+@router.post("/schedule/reset", response_model=ResetResponse)
+def reset_schedule(request: ResetRequest):
+    user_id = request.user_id
     timetable_ref = db.collection("users").document(user_id).collection("timetable")
-    docs = list(timetable_ref.stream())
-    
-    if not docs:
-        raise HTTPException(status_code=404, detail="시간표에 저장된 강의가 없습니다.")
 
-    for doc in docs:
-        doc.reference.delete()
+    # dry_run: 지울 문서 수만 세기
+    if request.dry_run:
+        count = sum(len(page) for page in _pages(timetable_ref))
+        if not count:
+            raise HTTPException(status_code=404, detail="시간표에 저장된 강의가 없습니다.")
+        return {"message": f"🧹 초기화하면 강의 {count}개가 삭제됩니다.", "count": count}
 
-    return {"message": "🧹 시간표가 초기화되었습니다."}
+    # 페이지(500개)마다 배치 삭제 하나, 커밋은 다음 페이지를 읽는 동안 병렬로
+    # 캐시에 있는 사용자면 그 사이 추가/삭제가 끼어들지 않게 잠금을 잡고
+    schedule = schedule_cache.peek(user_id)
+    with schedule.lock if schedule is not None else nullcontext():
+        try:
+            futures = [commit_pool.submit(_delete_page, page) for page in _pages(timetable_ref)]
+            count = sum(future.result() for future in futures)
+        except Exception:
+            schedule_cache.invalidate(user_id)
+            raise
+        if schedule is not None:
+            schedule.clear()
+
+    if not count:
+        raise HTTPException(status_code=404, detail="시간표에 저장된 강의가 없습니다.")
+    return {"message": "🧹 시간표가 초기화되었습니다.", "count": count}
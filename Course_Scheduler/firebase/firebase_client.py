@@ -1,17 +1,11 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
-import os
+from common.storage import get_storage
 
 # Firebase Admin SDK 인증 키 경로 (환경변수 또는 직접 설정)
 FIREBASE_KEY_PATH = "/etc/secrets/serviceAccountKey"
 
-# Firebase 초기화
-if not firebase_admin._apps:
-    cred = credentials.Certificate(FIREBASE_KEY_PATH)
-    firebase_admin.initialize_app(cred)
-
+# Firebase 초기화는 처음 클라이언트를 요청할 때 한 번 (STORAGE_BACKEND=memory/sqlite면 로컬 저장소)
 def get_firestore_client():
-    return firestore.client()
+    return get_storage(FIREBASE_KEY_PATH)
     
 # 찜한 강의 목록 불러오기
 def fetch_favorite_lectures(user_id: str):
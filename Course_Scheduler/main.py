@@ -1,8 +1,12 @@
 from fastapi import FastAPI
-from api import add_schedule, delete_schedule, update_schedule, reset_schedule, get_schedule
+from api import add_schedule, delete_schedule, update_schedule, reset_schedule, get_schedule, generate_schedule, compatible_schedule
 from fastapi.middleware.cors import CORSMiddleware
+from common.metrics import install_metrics
+from utils.course_index import get_course_index
+from utils.schedule_cache import schedule_cache
 
 app = FastAPI()
+install_metrics(app)
 
 # CORS 허용 설정 (필요 시 수정 가능)
 app.add_middleware(
@@ -13,13 +17,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 강의 CSV는 시작할 때 한 번 색인 (첫 요청이 로드 비용을 내지 않게)
+@app.on_event("startup")
+def load_course_index():
+    get_course_index()
+
 # 라우터 등록
 app.include_router(add_schedule.router)
 app.include_router(delete_schedule.router)
 app.include_router(update_schedule.router)
 app.include_router(reset_schedule.router)
+app.include_router(generate_schedule.router)
+app.include_router(compatible_schedule.router)
 app.include_router(get_schedule.router)
 
+@app.get("/admin/courses")
+def course_index_status():
+    return get_course_index().stats()
+
+@app.get("/admin/schedule-cache")
+def schedule_cache_status():
+    return schedule_cache.stats()
+
 @app.get("/")
 def root():
     return {"message": "✅ 시간표 API 서버가 실행 중입니다."}
@@ -0,0 +1,36 @@
+# 예전 uuid4 id로 저장된 시간표 문서를 (교과목명, 교수명, 분반) 고정 id로 한꺼번에 옮기기
+# 사용법: python migrate_timetable_ids.py [--dry-run]
+# API는 읽을 때 문서를 옮기지 않으므로 (읽기 요청에서 쓰기가 생기지 않게) 배포 후 이 스크립트로 한 번 옮겨 둔다.
+# 옮기기 전의 문서도 조회/삭제/수정은 과목명+교수명으로 찾으므로 그대로 동작한다.
+import argparse
+from firebase.firebase_client import get_firestore_client
+from utils.course_index import get_course_index
+from utils.timetable_docs import migrate_timetable, resolve_section
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시간표 문서 id를 고정 id로 옮기기")
+    parser.add_argument("--dry-run", action="store_true", help="옮길 문서 수만 세고 쓰지 않음")
+    args = parser.parse_args(argv)
+
+    db = get_firestore_client()
+    index = get_course_index()
+    users = pending = unresolved = 0
+    for user in db.collection("users").stream():
+        timetable_ref = user.reference.collection("timetable")
+        docs = [(doc.id, doc.to_dict()) for doc in timetable_ref.stream()]
+        legacy = [lecture for _, lecture in docs if not ("분반" in lecture and "교과목명" in lecture)]
+        if not legacy:
+            continue
+        users += 1
+        movable = sum(1 for lecture in legacy if resolve_section(index, lecture) is not None)
+        pending += movable
+        unresolved += len(legacy) - movable
+        if not args.dry_run and movable:
+            migrate_timetable(db, user.id, docs, index)
+    action = "옮길" if args.dry_run else "옮긴"
+    print(f"✅ 사용자 {users}명, {action} 문서 {pending}개, 분반을 찾지 못해 그대로 둔 문서 {unresolved}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Dict, List, Optional
 
 # ✅ 공통 요청 모델 (과목명 + 교수명 + user_id)
@@ -19,6 +19,13 @@ class UserOnlyRequest(BaseModel):
 class BaseResponse(BaseModel):
     message: str
 
+# ✅ 시간표 초기화 (dry_run이면 지울 강의 수만 세기)
+class ResetRequest(UserOnlyRequest):
+    dry_run: bool = False
+
+class ResetResponse(BaseResponse):
+    count: int
+
 # ✅ 강의 정보 (시간표 포함)
 class Lecture(BaseModel):
     과목명: str
@@ -29,3 +36,22 @@ class Lecture(BaseModel):
 # ✅ 추가 API 응답용 (강의 정보 포함)
 class ScheduleResponse(BaseResponse):
     data: Lecture
+
+# ✅ 여러 강의 한 번에 추가
+class LectureKey(BaseModel):
+    과목명: str
+    교수명: str
+
+class AddManyRequest(BaseModel):
+    user_id: str
+    lectures: List[LectureKey] = Field(..., min_length=1, max_length=100)
+
+class AddManyResponse(BaseResponse):
+    data: List[Lecture]
+
+# ✅ 시간표 자동 생성 요청 (찜한 강의로 겹치지 않는 조합 찾기)
+class GenerateRequest(BaseModel):
+    user_id: str
+    top_n: int = Field(5, ge=1, le=20)
+    time_budget_ms: int = Field(2000, ge=10, le=3000)    # 탐색 시간 제한
+    keep_existing: bool = False                          # 현재 시간표 강의와 겹치지 않는 조합만
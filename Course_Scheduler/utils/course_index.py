@@ -0,0 +1,135 @@
+import random
+import threading
+from utils.parser import load_course_csv, parse_timeslot
+from utils.timemask import to_mask
+
+# ===== 강의 분반 색인 =====
+# 서버 시작 시 CSV를 한 번 읽어 (교과목명, 교수) → 분반 목록으로 만들어 둔다.
+# 시간표 문자열은 이때 미리 파싱하고, '미정'이거나 형식이 잘못된 분반은 로드할 때 한 번만 표시해 둔다.
+# /schedule/add는 DataFrame 마스크 대신 dict 조회 한 번으로 분반을 찾는다.
+# 교시마다 그 교시를 쓰는 분반들도 정수 비트셋 하나(i번째 비트 = i번째 분반)로 만들어 둔다.
+# "지금 시간표에 들어갈 수 있는 분반"은 시간표가 차지한 교시마다의 분반 비트셋을 OR한 뒤 뒤집으면 된다
+# (분반끼리의 충돌 목록은 분반 수의 제곱이라 만들지 않음).
+TIMETABLE_UNDECIDED = "미정"
+TIMETABLE_MALFORMED = "형식 오류"
+
+
+class Section:
+    """강의 분반 하나 (CSV 한 행)"""
+    __slots__ = ('position', 'subject', 'professor', 'division', 'campus', 'timetable', 'slots', 'mask', 'problem')
+
+    def __init__(self, position, subject, professor, division, campus, timetable):
+        self.position = position                # 색인 안 순번 (분반 비트셋의 비트 위치)
+        self.subject = subject
+        self.professor = professor
+        self.division = division
+        self.campus = campus
+        self.timetable = timetable              # 원본 문자열 ('화/1-3,목/1')
+        self.slots = None                       # {'화': [1, 2, 3], '목': [1]}
+        self.mask = 0                           # 주간 비트마스크 (utils/timemask.py)
+        self.problem = None                     # None | TIMETABLE_UNDECIDED | TIMETABLE_MALFORMED
+        if timetable.strip() == TIMETABLE_UNDECIDED:
+            self.problem = TIMETABLE_UNDECIDED
+        else:
+            self.slots = parse_timeslot(timetable)
+            try:
+                self.mask = to_mask(self.slots)
+            except ValueError:
+                self.slots = None
+            if not self.slots:
+                self.problem = TIMETABLE_MALFORMED
+
+
+class CourseIndex:
+    def __init__(self, df):
+        self.sections = []
+        self.by_course = {}                     # (교과목명, 교수) → [Section]
+        for subject, professor, division, campus, timetable in zip(
+                df['교과목명'], df['교수'], df['분반'], df['캠퍼스'], df['시간표']):
+            section = Section(
+                len(self.sections), str(subject), str(professor), str(division),
+                None if campus != campus else str(campus),      # NaN → None
+                "" if timetable != timetable else str(timetable)
+            )
+            self.sections.append(section)
+            self.by_course.setdefault((section.subject, section.professor), []).append(section)
+
+        self.problems = {TIMETABLE_UNDECIDED: 0, TIMETABLE_MALFORMED: 0}
+        for section in self.sections:
+            if section.problem is not None:
+                self.problems[section.problem] += 1
+            if section.problem == TIMETABLE_MALFORMED:
+                print(f"[WARN] 시간표 형식 오류: {section.subject} / {section.professor} "
+                      f"({section.division}분반) '{section.timetable}'")
+        self._build_slot_index()
+
+    def _build_slot_index(self):
+        self.valid = 0                          # 시간표가 있는 분반 비트셋
+        self.slot_sections = {}                 # 교시 비트 번호 → 그 교시를 쓰는 분반 비트셋
+        for section in self.sections:
+            if section.problem is not None:
+                continue
+            self.valid |= 1 << section.position
+            for bit in _bits(section.mask):
+                self.slot_sections[bit] = self.slot_sections.get(bit, 0) | (1 << section.position)
+
+    def blocked_by(self, mask):
+        """시간표 비트마스크와 겹치는 분반 비트셋"""
+        blocked = 0
+        for bit in _bits(mask):
+            blocked |= self.slot_sections.get(bit, 0)
+        return blocked
+
+    def compatible(self, mask):
+        """시간표 비트마스크와 겹치지 않는 (시간표가 있는) 분반 비트셋"""
+        return self.valid & ~self.blocked_by(mask)
+
+    def sections_in(self, bitset):
+        return [self.sections[i] for i in _bits(bitset)]
+
+    def lookup(self, subject, professor):
+        return self.by_course.get((subject, professor), [])
+
+    def pick(self, subject, professor):
+        """분반 하나를 무작위로 선택 → (Section 또는 None, 분반이 여러 개인지)"""
+        sections = self.lookup(subject, professor)
+        if not sections:
+            return None, False
+        return random.choice(sections), len(sections) > 1
+
+    def stats(self):
+        return {
+            "sections": len(self.sections),
+            "courses": len(self.by_course),
+            "problems": dict(self.problems),
+            "slots": len(self.slot_sections)
+        }
+
+
+def _bits(value):
+    """정수의 켜진 비트 번호들 (낮은 비트부터)"""
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def build_course_index():
+    return CourseIndex(load_course_csv())
+
+
+def get_course_index():
+    """프로세스 공용 색인 (처음 부를 때 로드, main의 startup에서 미리 로드)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = build_course_index()
+            stats = _index.stats()
+            print(f"[BOOT] 강의 색인 로드 완료: 분반 {stats['sections']}개, 강의 {stats['courses']}개, "
+                  f"시간표 미정 {stats['problems'][TIMETABLE_UNDECIDED]}개, "
+                  f"형식 오류 {stats['problems'][TIMETABLE_MALFORMED]}개")
+        return _index
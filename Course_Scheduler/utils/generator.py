@@ -0,0 +1,116 @@
+import heapq
+import time
+from itertools import count
+from utils.timemask import overlaps
+
+# ===== 찜한 강의로 겹치지 않는 시간표 자동 생성 =====
+# 강의마다 "분반 중 하나를 넣거나 / 빼거나"를 고르는 백트래킹.
+#  - 분반 선택지가 적은 강의부터 (막히는 강의를 먼저 정해서 가지치기가 빨리 일어나게),
+#    그 안에서는 공통 교시 순으로 (서로 겹치는 강의가 이어져서 넣기/빼기가 빨리 갈리게)
+#  - 겹침 검사는 비트마스크 AND 한 번, 시간이 같은 분반(같은 캠퍼스)은 하나로 합쳐 둠
+#  - 뺀 강의 중 아직 들어갈 수 있는 게 있으면 결과로 치지 않음 (더 넣을 수 있는 시간표는 제외)
+#  - 지금까지 넣은 강의 수 + 더 넣을 수 있는 강의 수의 상한이 상위 N개의 최저 점수를 넘지 못하면 더 내려가지 않음
+#    (상한은 공통 교시가 겹치는 강의 묶음마다 하나씩만 셈)
+#  - time_budget초가 지나면 그때까지 찾은 상위 N개를 반환 (complete=False)
+# 순위: 넣은 강의 수(많을수록) → 캠퍼스 수(적을수록), 같으면 먼저 찾은 시간표
+NEUTRAL_CAMPUSES = {'공용'}
+
+
+class CourseOptions:
+    """찜한 강의 하나와 넣을 수 있는 분반들"""
+    __slots__ = ('key', 'sections', 'common')
+
+    def __init__(self, key, sections):
+        self.key = key                          # (과목명, 교수명)
+        self.sections = sections                # 시간이 서로 다른 분반들 (Section)
+        # 모든 분반이 같이 쓰는 교시 비트 (분반이 하나면 그 분반 시간 전체).
+        # 이 교시를 하나라도 같이 쓰는 강의끼리는 어느 분반을 골라도 겹친다
+        self.common = 0
+        if sections:
+            self.common = sections[0].mask
+            for section in sections[1:]:
+                self.common &= section.mask
+
+
+def distinct_sections(sections, base_mask=0):
+    """시간표가 있고 base_mask와 겹치지 않는 분반만, 시간/캠퍼스가 같은 분반은 첫 번째만"""
+    seen = set()
+    result = []
+    for section in sections:
+        if section.problem is not None or overlaps(section.mask, base_mask):
+            continue
+        key = (section.mask, section.campus)
+        if key not in seen:
+            seen.add(key)
+            result.append(section)
+    return result
+
+
+def _campus_count(chosen):
+    return len({s.campus for _, s in chosen if s.campus and s.campus not in NEUTRAL_CAMPUSES})
+
+
+def _fits(course, mask):
+    return any(not section.mask & mask for section in course.sections)
+
+
+def generate_timetables(courses, base_mask=0, top_n=5, time_budget=2.0):
+    """courses: [CourseOptions] → (상위 시간표 목록, 탐색을 끝까지 했는지)
+    시간표 하나는 [(CourseOptions, Section)] (점수 높은 순)"""
+    courses = sorted((c for c in courses if c.sections),
+                     key=lambda c: (len(c.sections), c.common & -c.common, c.key))
+    deadline = time.perf_counter() + time_budget
+    top = []                                    # (점수, -순번, 선택) 최소 힙 (동점이면 나중에 찾은 것이 먼저 밀려남)
+    tie = count()
+    chosen = []
+    skipped = []
+    state = {'complete': True, 'nodes': 0}
+
+    def fits_later(start, mask):
+        # 남은 강의 중 지금 시간표에 더 넣을 수 있는 강의 수의 상한 (공통 교시가 겹치는 강의끼리는 하나만)
+        bound, groups = 0, 0
+        for c in courses[start:]:
+            if not _fits(c, mask):
+                continue
+            if not c.common:
+                bound += 1
+            elif not c.common & groups:
+                groups |= c.common & -c.common
+                bound += 1
+        return bound
+
+    def search(i, mask):
+        state['nodes'] += 1
+        if state['nodes'] % 256 == 0 and time.perf_counter() > deadline:
+            state['complete'] = False
+            return False
+        campuses = _campus_count(chosen)
+        if i == len(courses):
+            if chosen and not any(_fits(c, mask) for c in skipped):
+                entry = ((len(chosen), -campuses), -next(tie), list(chosen))
+                if len(top) < top_n:
+                    heapq.heappush(top, entry)
+                elif entry[0] > top[0][0]:
+                    heapq.heapreplace(top, entry)
+            return True
+        # 앞으로 얻을 수 있는 가장 좋은 점수: 강의 수는 상한까지, 캠퍼스 수는 지금 그대로.
+        # 동점은 기존 항목을 밀어내지 못하므로 같아도 가지치기
+        if len(top) == top_n and (len(chosen) + fits_later(i, mask), -campuses) <= top[0][0]:
+            return True
+        course = courses[i]
+        for section in course.sections:
+            if section.mask & mask:
+                continue
+            chosen.append((course, section))
+            keep_going = search(i + 1, mask | section.mask)
+            chosen.pop()
+            if not keep_going:
+                return False
+        skipped.append(course)
+        keep_going = search(i + 1, mask)
+        skipped.pop()
+        return keep_going
+
+    search(0, base_mask)
+    ranked = [entry[2] for entry in sorted(top, key=lambda e: (e[0], e[1]), reverse=True)]
+    return ranked, state['complete']
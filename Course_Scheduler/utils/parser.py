@@ -1,8 +1,10 @@
 import pandas as pd
 from collections import defaultdict
-import random
+from common.metrics import timed
+from utils.timemask import to_mask, schedule_mask, overlaps
 
 # CSV 로드 함수 (매번 호출 시 메모리 절약 가능)
+@timed("catalog_load")
 def load_course_csv(csv_path: str = 'data/합쳐진_파일_최종_필요컬럼만_수정.csv') -> pd.DataFrame:
     return pd.read_csv(csv_path)
 
@@ -25,24 +27,7 @@ def parse_timeslot(timestr: str):
     except:
         return None
 
-# 시간표 겹침 검사 함수
+# 시간표 겹침 검사 함수 (비트마스크 AND 한 번)
+# existing_schedule: 시간표 문서 목록 또는 시간표({'화': [1, 2, 3]}) 목록
 def is_overlapping(new_time: dict, existing_schedule: list) -> bool:
-    for day in new_time:
-        new_slots = set(new_time[day])
-        for lec in existing_schedule:
-            lec_time = lec.get('시간표')
-            if not lec_time:
-                continue
-            if day in lec_time:
-                if new_slots & set(lec_time[day]):
-                    return True
-    return False
-
-# 분반 여부 판단 및 랜덤 선택 함수
-def get_random_course_row(df: pd.DataFrame, subject: str, professor: str):
-    matches = df[(df['교과목명'] == subject) & (df['교수'] == professor)]
-    if matches.empty:
-        return None, False
-    selected = matches.sample(n=1).iloc[0]
-    is_divided = len(matches) > 1
-    return selected, is_divided
+    return overlaps(to_mask(new_time), schedule_mask(existing_schedule))
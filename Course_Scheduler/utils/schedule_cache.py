@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from firebase.firebase_client import get_firestore_client
+from common.metrics import timed
+from utils.timemask import lecture_mask
+
+# ===== 사용자별 시간표/찜 목록 캐시 (write-through) =====
+# 사용자마다 찜한 강의(과목명, 교수명)와 시간표 문서들, 시간표 전체 점유 비트마스크를 들고 있는다.
+# 추가/삭제/수정/초기화는 Firestore에 쓴 다음 캐시도 같이 고치므로, 캐시에 있는 사용자는 읽기 없이 쓰기 한 번으로 끝난다.
+# 찜 목록은 앱이 Firestore에 직접 쓰기 때문에, 캐시에 없는 강의를 찾을 때는 찜 목록만 한 번 다시 읽는다.
+# 서버 워커가 여러 개면 워커마다 캐시가 따로라 다른 워커의 수정은 TTL이 지나야 보인다.
+# 읽기 경로에서는 쓰지 않는다: 예전 uuid id 문서는 migrate_timetable_ids.py로 따로 옮긴다.
+SCHEDULE_CACHE_SIZE = int(os.getenv("SCHEDULE_CACHE_SIZE", "10000"))
+SCHEDULE_CACHE_TTL = float(os.getenv("SCHEDULE_CACHE_TTL", "300"))
+
+
+class UserSchedule:
+    """한 사용자의 찜 목록 + 시간표 (수정은 lock을 잡고)"""
+
+    def __init__(self, favorites, timetable):
+        self.lock = threading.Lock()
+        self.favorites = {}                     # (과목명, 교수명) → 찜 문서
+        self.timetable = OrderedDict()          # 문서 id → 시간표 문서
+        self.mask = 0                           # 시간표 전체 점유 비트마스크
+        self.favorites_read_at = 0.0            # 찜 목록을 마지막으로 읽은 시각 (monotonic)
+        self.set_favorites(favorites)
+        for doc_id, lecture in timetable:
+            self.add(doc_id, lecture)
+
+    def set_favorites(self, favorites):
+        self.favorites = {(fav.get("과목명"), fav.get("교수명")): fav for fav in favorites}
+        self.favorites_read_at = time.monotonic()
+
+    def is_favorite(self, subject, professor):
+        return (subject, professor) in self.favorites
+
+    def lectures(self):
+        return list(self.timetable.values())
+
+    def find(self, subject, professor):
+        """과목명 일부 + 교수명으로 시간표 문서 찾기 → (문서 id, 문서) 또는 (None, None)"""
+        for doc_id, lecture in self.timetable.items():
+            if subject in lecture.get("과목명", "") and lecture.get("교수명") == professor:
+                return doc_id, lecture
+        return None, None
+
+    def add(self, doc_id, lecture):
+        self.timetable[doc_id] = lecture
+        self.mask |= _safe_mask(doc_id, lecture)
+
+    def remove(self, doc_id):
+        self.timetable.pop(doc_id, None)
+        self._recompute_mask()
+
+    def rename(self, doc_id, new_subject):
+        self.timetable[doc_id]["과목명"] = new_subject
+
+    def clear(self):
+        self.timetable.clear()
+        self.mask = 0
+
+    def _recompute_mask(self):
+        mask = 0
+        for doc_id, lecture in self.timetable.items():
+            mask |= _safe_mask(doc_id, lecture, warn=False)
+        self.mask = mask
+
+
+def _safe_mask(doc_id, lecture, warn=True):
+    """시간표 형식이 잘못된 문서는 점유 없음(0)으로 (사용자 요청 전체가 500이 되지 않게)"""
+    try:
+        return lecture_mask(lecture)
+    except ValueError as e:
+        if warn:
+            print(f"[WARN] 시간표 문서 {doc_id} 형식 오류, 점유 없음으로 처리: {e}")
+        return 0
+
+
+class ScheduleCache:
+    """사용자별 UserSchedule의 LRU + TTL 캐시"""
+
+    def __init__(self, db, max_size=SCHEDULE_CACHE_SIZE, ttl=SCHEDULE_CACHE_TTL):
+        self.db = db
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()             # user_id → (만료 시각, UserSchedule)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _user_ref(self, user_id):
+        return self.db.collection("users").document(user_id)
+
+    @timed("firestore_read")
+    def _read_favorites(self, user_id):
+        return [doc.to_dict() for doc in self._user_ref(user_id).collection("favorites").stream()]
+
+    @timed("firestore_read")
+    def _read_timetable(self, user_id):
+        return [(doc.id, doc.to_dict()) for doc in self._user_ref(user_id).collection("timetable").stream()]
+
+    def get(self, user_id):
+        """캐시에 있으면 그대로, 없거나 만료됐으면 Firestore에서 찜 목록 + 시간표를 읽어서 채움"""
+        with self._lock:
+            item = self._items.get(user_id)
+            if item is not None and item[0] >= time.monotonic():
+                self._items.move_to_end(user_id)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+        entry = UserSchedule(self._read_favorites(user_id), self._read_timetable(user_id))
+        with self._lock:
+            # 그 사이 다른 요청이 먼저 채웠으면 그쪽 사용 (같은 사용자의 수정이 lock 하나로 모이게)
+            item = self._items.get(user_id)
+            if item is not None and item[0] >= time.monotonic():
+                return item[1]
+            if self.max_size > 0:
+                self._items[user_id] = (time.monotonic() + self.ttl, entry)
+                self._items.move_to_end(user_id)
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+        return entry
+
+    def peek(self, user_id):
+        """읽기 없이 캐시에 있는 것만 (없으면 None)"""
+        with self._lock:
+            item = self._items.get(user_id)
+            return item[1] if item is not None and item[0] >= time.monotonic() else None
+
+    def refresh_favorites(self, user_id, since=None):
+        """찜 목록만 다시 읽기 (앱에서 방금 찜한 강의가 캐시에 없을 때).
+        since(monotonic) 이후에 이미 읽었으면 다시 읽지 않음"""
+        entry = self.get(user_id)
+        if since is not None and entry.favorites_read_at >= since:
+            return entry
+        favorites = self._read_favorites(user_id)
+        with entry.lock:
+            entry.set_favorites(favorites)
+        return entry
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._items.pop(user_id, None)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._items)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+schedule_cache = ScheduleCache(get_firestore_client())
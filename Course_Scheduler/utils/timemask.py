@@ -0,0 +1,91 @@
+# ===== 주간 시간표 비트마스크 =====
+# 한 주 시간표를 정수 하나로 표현: 요일마다 16비트, p교시 → (요일 순번 * 16 + p - 1)번 비트
+#   {'화': [1, 2, 3]} → 0b111 << 16
+# 겹침 검사는 a & b, 빈 시간은 ~mask, 시간표 합치기는 a | b 한 번으로 끝난다.
+# 앱과 주고받는 형식은 그대로 {'화': [1, 2, 3]} (from_mask로 되돌림).
+# Firestore 정수는 64비트라 7일 × 16비트(112비트)를 그대로 넣을 수 없으므로
+# 문서에는 요일별 정수 맵 {'화': 7}로 저장한다 (MASK_FIELD).
+DAYS = ('월', '화', '수', '목', '금', '토', '일')
+PERIOD_BITS = 16                                # 요일당 비트 수 (1~16교시)
+DAY_FULL = (1 << PERIOD_BITS) - 1
+WEEK_FULL = (1 << (PERIOD_BITS * len(DAYS))) - 1
+MASK_FIELD = "시간표마스크"                      # 시간표 문서에 함께 저장하는 요일별 비트마스크
+_DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+
+
+def to_mask(timetable):
+    """{'화': [1, 2, 3]} → 정수 비트마스크 (모르는 요일/범위 밖 교시는 ValueError)"""
+    mask = 0
+    for day, periods in (timetable or {}).items():
+        if day not in _DAY_INDEX:
+            raise ValueError(f"알 수 없는 요일: {day}")
+        offset = _DAY_INDEX[day] * PERIOD_BITS
+        for period in periods:
+            period = int(period)
+            if not 1 <= period <= PERIOD_BITS:
+                raise ValueError(f"범위 밖 교시: {day}/{period}")
+            mask |= 1 << (offset + period - 1)
+    return mask
+
+
+def from_mask(mask):
+    """정수 비트마스크 → {'화': [1, 2, 3]} (요일 순서, 빈 요일은 빠짐)"""
+    timetable = {}
+    for day, day_bits in zip(DAYS, _day_bits(mask)):
+        if day_bits:
+            timetable[day] = [p + 1 for p in range(PERIOD_BITS) if day_bits >> p & 1]
+    return timetable
+
+
+def _day_bits(mask):
+    return [(mask >> (i * PERIOD_BITS)) & DAY_FULL for i in range(len(DAYS))]
+
+
+def to_day_masks(mask):
+    """Firestore 저장용 {'화': 7}"""
+    return {day: day_bits for day, day_bits in zip(DAYS, _day_bits(mask)) if day_bits}
+
+
+def from_day_masks(day_masks):
+    mask = 0
+    for day, day_bits in day_masks.items():
+        mask |= (int(day_bits) & DAY_FULL) << (_DAY_INDEX[day] * PERIOD_BITS)
+    return mask
+
+
+def overlaps(a, b):
+    return (a & b) != 0
+
+
+def merge(*masks):
+    combined = 0
+    for mask in masks:
+        combined |= mask
+    return combined
+
+
+def free_slots(mask, within=WEEK_FULL):
+    """within(기본: 한 주 전체) 중 비어 있는 시간 → {'월': [...], ...}"""
+    return from_mask(within & ~mask)
+
+
+def lecture_mask(lecture):
+    """시간표 문서 하나의 비트마스크 (저장된 MASK_FIELD가 있으면 그대로, 없으면 '시간표'에서 계산)"""
+    day_masks = lecture.get(MASK_FIELD)
+    if day_masks:
+        return from_day_masks(day_masks)
+    return to_mask(lecture.get("시간표"))
+
+
+def schedule_mask(schedule):
+    """시간표 문서 목록 → 전체 점유 비트마스크.
+    항목은 시간표 문서({'과목명', '시간표', ...})나 시간표 자체({'화': [1, 2, 3]}) 모두 가능"""
+    occupied = 0
+    for item in schedule:
+        if not item:
+            continue
+        if MASK_FIELD in item or "시간표" in item:
+            occupied |= lecture_mask(item)
+        else:
+            occupied |= to_mask(item)
+    return occupied
@@ -0,0 +1,77 @@
+import hashlib
+from common.metrics import timed
+from utils.timemask import MASK_FIELD, lecture_mask, to_day_masks
+
+# ===== 시간표 문서 id / 저장 형식 =====
+# 시간표 문서 id는 (교과목명, 교수명, 분반)에서 만든 고정 id → 같은 강의는 항상 같은 문서.
+# 삭제/수정은 문서 id를 알면 쓰기 한 번으로 끝난다 (과목명은 수정될 수 있으므로 원래 이름은 '교과목명'에 따로 둠).
+# 예전에 uuid4 id로 저장된 문서는 카탈로그에서 분반을 찾아 고정 id로 옮긴다 (migrate_timetable).
+DIVIDED_SUFFIX = "(분반)"
+BATCH_WRITE_LIMIT = 500                         # Firestore 배치 쓰기 최대 연산 수
+
+
+def lecture_doc_id(subject, professor, division):
+    raw = "\x1f".join((str(subject), str(professor), str(division)))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def build_lecture(section, is_divided):
+    """카탈로그 분반 → (문서 id, 시간표 문서)"""
+    lecture = {
+        "과목명": section.subject + DIVIDED_SUFFIX if is_divided else section.subject,
+        "교수명": section.professor,
+        "시간표": section.slots,
+        "캠퍼스": section.campus,
+        "교과목명": section.subject,
+        "분반": section.division,
+        MASK_FIELD: to_day_masks(section.mask)
+    }
+    return lecture_doc_id(section.subject, section.professor, section.division), lecture
+
+
+def resolve_section(index, lecture):
+    """예전 형식 문서의 분반 찾기: 과목명(분반 표시 제거) + 교수명이 같고 시간표가 같은 분반"""
+    subject = lecture.get("교과목명") or lecture.get("과목명", "")
+    if subject.endswith(DIVIDED_SUFFIX):
+        subject = subject[:-len(DIVIDED_SUFFIX)]
+    try:
+        mask = lecture_mask(lecture)
+    except ValueError:
+        return None
+    for section in index.lookup(subject, lecture.get("교수명")):
+        if section.problem is None and section.mask == mask:
+            return section
+    return None
+
+
+def migrate_timetable(db, user_id, docs, index):
+    """docs: [(문서 id, 문서)] → 고정 id로 옮긴 뒤의 [(문서 id, 문서)].
+    분반을 찾지 못한 문서(과목명이 수정된 경우 등)는 그대로 둔다. 옮기는 쓰기는 배치 하나(500개씩)"""
+    timetable_ref = db.collection("users").document(user_id).collection("timetable")
+    result, moves = [], []
+    for doc_id, lecture in docs:
+        if "분반" in lecture and "교과목명" in lecture:
+            result.append((doc_id, lecture))
+            continue
+        section = resolve_section(index, lecture)
+        if section is None:
+            result.append((doc_id, lecture))
+            continue
+        new_id = lecture_doc_id(section.subject, section.professor, section.division)
+        migrated = dict(lecture, 교과목명=section.subject, 분반=section.division)
+        migrated[MASK_FIELD] = to_day_masks(section.mask)
+        moves.append((doc_id, new_id, migrated))
+        result.append((new_id, migrated))
+    if not moves:
+        return docs
+    with timed("firestore_write"):
+        for start in range(0, len(moves), BATCH_WRITE_LIMIT // 2):
+            batch = db.batch()
+            for old_id, new_id, migrated in moves[start:start + BATCH_WRITE_LIMIT // 2]:
+                batch.set(timetable_ref.document(new_id), migrated)
+                if old_id != new_id:
+                    batch.delete(timetable_ref.document(old_id))
+            batch.commit()
+    print(f"[MIGRATE] {user_id}: 시간표 문서 {len(moves)}개를 고정 id로 옮김")
+    # 같은 분반이 두 번 들어 있던 경우 하나로
+    return list(dict(result).items())
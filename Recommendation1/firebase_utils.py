@@ -1,11 +1,23 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from common.metrics import timed
+from common.storage import get_storage
+from common.cache import PRECOMPUTED_COLLECTION, PRECOMPUTED_DOC_ID
+from common.write_behind import WriteBehindQueue
 
-cred = credentials.Certificate("/etc/secrets/firebase_config")
-firebase_admin.initialize_app(cred)
-db = firestore.client()
+BATCH_WRITE_LIMIT = 500  # Firestore 배치 쓰기 최대 연산 수
+FETCH_WORKERS = 16
 
+# Firestore 읽기를 동시에 보내기 위한 공용 스레드 풀 (크기 제한)
+io_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+
+# STORAGE_BACKEND=firestore(기본)면 Firestore, memory/sqlite면 로컬 저장소 (common/storage.py)
+db = get_storage("/etc/secrets/firebase_config")
+
+# 추천 결과 쓰기는 동시에 들어온 것끼리 배치로 (common/write_behind.py, main의 startup/shutdown에서 시작/정리)
+write_queue = WriteBehindQueue(db, timed)
+
+@timed("firestore_read")
 def fetch_user_input(user_id):
     doc = db.collection("users").document(user_id).get()
     return doc.to_dict() if doc.exists else None
@@ -13,12 +25,14 @@ def fetch_user_input(user_id):
 def save_recommendations(user_id, recommendations):
     doc_id = datetime.now().isoformat()
     doc_ref = db.collection("users").document(user_id).collection("results").document(doc_id)
-    doc_ref.set({
+    # 쓰기 큐에 넣고 바로 돌아감 (응답 본문에 추천 결과가 그대로 담김)
+    write_queue.set(doc_ref, {
         "createdAt": doc_id,
         "majorRecommendations": recommendations
     })
     return doc_id 
 
+@timed("firestore_read")
 def fetch_previous_courses(user_id):
     courses_ref = db.collection("users").document(user_id).collection("previous_courses")
     docs = courses_ref.stream()
@@ -28,3 +42,41 @@ def fetch_previous_courses(user_id):
         course_key = (data.get("과목명"), data.get("교수명"))
         previous_courses.add(course_key)
     return previous_courses
+
+
+# 미리 계산된 추천 결과 (precompute 작업이 저장, 없으면 None)
+@timed("firestore_read")
+def fetch_precomputed(user_id):
+    doc = db.collection("users").document(user_id).collection(PRECOMPUTED_COLLECTION).document(PRECOMPUTED_DOC_ID).get()
+    return doc.to_dict() if doc.exists else None
+
+# 사용자 정보 + 이전 수강 강의 + 미리 계산된 추천을 동시에 불러오기
+def fetch_recommend_inputs(user_id):
+    futures = [io_pool.submit(fn, user_id) for fn in (fetch_user_input, fetch_previous_courses, fetch_precomputed)]
+    return tuple(f.result() for f in futures)
+
+
+# ===== 여러 사용자 일괄 처리 =====
+@timed("firestore_read")
+def fetch_user_inputs(user_ids):
+    refs = [db.collection("users").document(uid) for uid in user_ids]
+    docs = {doc.id: doc.to_dict() for doc in db.get_all(refs) if doc.exists}
+    return {uid: docs.get(uid) for uid in user_ids}
+
+def fetch_previous_courses_many(user_ids):
+    return dict(zip(user_ids, io_pool.map(fetch_previous_courses, user_ids)))
+
+@timed("firestore_write")
+def save_recommendations_batch(recommendations_by_user):
+    doc_id = datetime.now().isoformat()
+    items = list(recommendations_by_user.items())
+    for start in range(0, len(items), BATCH_WRITE_LIMIT):
+        batch = db.batch()
+        for user_id, recommendations in items[start:start + BATCH_WRITE_LIMIT]:
+            doc_ref = db.collection("users").document(user_id).collection("results").document(doc_id)
+            batch.set(doc_ref, {
+                "createdAt": doc_id,
+                "majorRecommendations": recommendations
+            })
+        batch.commit()
+    return doc_id
@@ -1,21 +1,59 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from firebase_utils import fetch_user_input, save_recommendations, fetch_previous_courses
-from recommend import recommend_major_lectures
+from typing import List
+from firebase_utils import (
+    fetch_recommend_inputs, save_recommendations, write_queue,
+    fetch_user_inputs, fetch_previous_courses_many, save_recommendations_batch
+)
+from major.recommend import recommend_major_lectures, recommend_major_lectures_batch, recommendation_cache
+from major.catalog import get_catalogs, catalog_manager, CatalogNotFound
+from common.metrics import install_metrics
+
+MAX_BATCH_USERS = 1000
 
 app = FastAPI()
+install_metrics(app)
+
+# 서버 시작 시 강의 카탈로그 미리 로드 (요청 중 파일 I/O 없음)
+get_catalogs()
 
 @app.get("/")
 def read_root():
     return {"message": "수강요정 추천시스템 FastAPI입니다!"}
+
+@app.get("/cache/stats")
+def cache_stats():
+    return recommendation_cache.stats()
+
+# 카탈로그 파일이 바뀌면 재배포 없이 교체 (CATALOG_WATCH_INTERVAL초마다 확인)
+@app.on_event("startup")
+def start_catalog_watcher():
+    catalog_manager.start()
+    write_queue.start()
+
+# 종료 전에 쌓여 있는 추천 결과 쓰기를 모두 보냄
+@app.on_event("shutdown")
+def stop_catalog_watcher():
+    catalog_manager.stop()
+    write_queue.stop()
+
+@app.get("/admin/catalog")
+def catalog_status():
+    status = catalog_manager.status()
+    status["catalogs"] = len(get_catalogs())
+    return status
+
+@app.get("/admin/writes")
+def write_status():
+    return write_queue.stats()
     
 class UserRequest(BaseModel):
     user_id: str
 
 @app.post("/recommend/")
 def recommend(user: UserRequest):
-    # 1. 사용자 기본 정보 로드
-    user_doc = fetch_user_input(user.user_id)
+    # 1. 사용자 기본 정보 + 이전 수강 강의 + 미리 계산된 추천을 동시에 로드
+    user_doc, previous_courses, precomputed = fetch_recommend_inputs(user.user_id)
     if not user_doc:
         return {"error": "사용자 정보 없음"}
 
@@ -23,19 +61,58 @@ def recommend(user: UserRequest):
     profile = user_doc.get("profile", {})
     preferences = user_doc.get("preferences", {}).get("major", {})
 
-    # 3. DB에서 이전 수강 강의 불러오기
-    previous_courses = fetch_previous_courses(user.user_id)
-
-     # 4. 추천 실행
+     # 3. 추천 실행 (선호/수강 이력/카탈로그가 그대로면 미리 계산된 결과 사용)
     user_input = {
         "profile": profile,
         "preferences": {
             "major": preferences
         }
     }
-    results = recommend_major_lectures(user_input, previous_courses)
+    try:
+        results = recommend_major_lectures(user_input, previous_courses, precomputed)
+    except CatalogNotFound:
+        return {"error": "해당 전공의 강의 정보 없음"}
 
-    # 5. 결과 저장
+    # 4. 결과 저장 (쓰기 큐에 넣고 바로 응답, 배치로 모아서 저장)
     save_recommendations(user.user_id, results)
     
     return {"user_id": user.user_id, "recommendations": results}
+
+
+class BatchRequest(BaseModel):
+    user_ids: List[str]
+    save: bool = True
+
+@app.post("/recommend/batch")
+def recommend_batch(request: BatchRequest):
+    user_ids = list(dict.fromkeys(request.user_ids))  # 중복 제거 (순서 유지)
+    if len(user_ids) > MAX_BATCH_USERS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_USERS}명까지 요청할 수 있습니다.")
+
+    # 1. 사용자 정보 + 이전 수강 강의 일괄 로드
+    user_docs = fetch_user_inputs(user_ids)
+    found_ids = [uid for uid in user_ids if user_docs.get(uid)]
+    previous_courses = fetch_previous_courses_many(found_ids)
+
+    # 2. 카탈로그별 행렬곱 한 번으로 일괄 추천
+    user_inputs = [{
+        "profile": user_docs[uid].get("profile", {}),
+        "preferences": {"major": user_docs[uid].get("preferences", {}).get("major", {})}
+    } for uid in found_ids]
+    batch_results = recommend_major_lectures_batch(user_inputs, [previous_courses[uid] for uid in found_ids])
+
+    results, errors = {}, {}
+    for uid in user_ids:
+        if uid not in previous_courses:
+            errors[uid] = "사용자 정보 없음"
+    for uid, recommendations in zip(found_ids, batch_results):
+        if recommendations is None:
+            errors[uid] = "전공 강의 정보 또는 선호 정보 없음"
+        else:
+            results[uid] = recommendations
+
+    # 3. 결과 일괄 저장
+    if request.save and results:
+        save_recommendations_batch(results)
+
+    return {"results": results, "errors": errors}
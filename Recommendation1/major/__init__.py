@@ -0,0 +1,4 @@
+# ===== 전공 추천 엔진 =====
+# 전공 카탈로그(catalog), 사용자 선호 벡터 스키마(feature_schema), 추천 계산(recommend).
+# 이 서비스의 main.py와 교양 서비스(Recommendation2)의 통합 추천이 같이 쓰므로
+# 서비스 모듈(main, firebase_utils)과 이름이 겹치지 않게 major 패키지로 묶어 둔다.
@@ -0,0 +1,174 @@
+import ast
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import normalize
+
+from common.bundle import (
+    BUNDLE_DIR_NAME, catalog_fingerprint, content_version, read_bundle, table_arrays, write_bundle
+)
+from common.catalog_manager import CatalogManager
+from common.metrics import timed
+
+# ===== 카탈로그 설정 =====
+# 이 패키지는 교양 서비스(Recommendation2)의 통합 추천에서도 불러오므로
+# 그쪽 카탈로그용 CATALOG_DATA_DIR과 섞이지 않게 MAJOR_CATALOG_DATA_DIR을 따로 읽는다 (없으면 Recommendation1/data)
+DATA_DIR = os.getenv(
+    "MAJOR_CATALOG_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+)
+FILE_PREFIX = "강의_벡터화_"
+VECTOR_DIM = 18
+META_COLUMNS = ['과목명', '교수명', '개설학과전공', '영역']
+
+
+class CatalogNotFound(KeyError):
+    """요청한 (단과대학, 전공, 세부전공) 카탈로그가 없음"""
+
+
+class LectureCatalog:
+    """전공(세부전공) 하나의 강의 목록: 벡터 행렬 + 컬럼별 메타데이터 배열"""
+
+    def __init__(self, key, matrix, meta, normalized=None):
+        self.key = key
+        self.matrix = matrix                    # (N, 18) 원본 벡터 (추천 이유 해석용)
+        # 코사인 유사도용 정규화 벡터 (번들에서는 mmap으로 공유)
+        self.normalized = normalize(matrix) if normalized is None else normalized
+        self.meta = meta                        # {컬럼명: np.ndarray}
+        self._area_masks = {}
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def area_mask(self, 학년_영역):
+        """'1영역' 같은 학년 영역 필터 마스크 (학년별로 한 번만 계산)"""
+        mask = self._area_masks.get(학년_영역)
+        if mask is None:
+            mask = np.array([학년_영역 in str(a) for a in self.meta['영역']], dtype=bool)
+            self._area_masks[학년_영역] = mask
+        return mask
+
+
+class MajorCatalogs:
+    """전체 전공 카탈로그 묶음: 버전 + {(단과대학, 전공, 세부전공): LectureCatalog}"""
+
+    def __init__(self, version, tables):
+        self.version = version
+        self.tables = tables
+
+    def __len__(self):
+        return len(self.tables)
+
+    def get(self, key):
+        return self.tables.get(key)
+
+
+# ===== 파일명 → 카탈로그 키 =====
+def catalog_key(dept, major=None, sub=None):
+    return (dept, major or None, sub or None)
+
+
+def key_from_filename(path):
+    # 강의_벡터화_{단과대학}_{전공}[_{세부전공}].csv
+    stem = os.path.splitext(os.path.basename(path))[0][len(FILE_PREFIX):]
+    parts = stem.split('_', 2)
+    return catalog_key(*parts)
+
+
+def catalog_csv_paths(data_dir=DATA_DIR):
+    return sorted(glob.glob(os.path.join(data_dir, f"{FILE_PREFIX}*.csv")))
+
+
+# ===== 벡터 문자열 파싱 (깨진 행은 None) =====
+def parse_vector(value, dim):
+    try:
+        vector = ast.literal_eval(value)[:dim]
+    except (ValueError, SyntaxError, TypeError):
+        return None
+    return vector if len(vector) == dim else None
+
+
+# ===== CSV 한 개 로드 =====
+def load_catalog_csv(path):
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    vectors = [parse_vector(v, VECTOR_DIM) for v in df['전체벡터']]
+    valid = np.array([v is not None for v in vectors], dtype=bool)
+    if not valid.all():
+        print(f"[WARN] {os.path.basename(path)}: 벡터가 깨진 {int((~valid).sum())}개 행 제외")
+        df = df[valid]
+        vectors = [v for v in vectors if v is not None]
+    matrix = np.array(vectors, dtype=float).reshape(len(df), VECTOR_DIM)
+    meta = {col: df[col].astype(object).where(df[col].notna(), None).to_numpy() for col in META_COLUMNS}
+    return LectureCatalog(key_from_filename(path), matrix, meta)
+
+
+# ===== 번들 빌드 (python build_catalog.py) =====
+def build_bundle(data_dir=DATA_DIR):
+    paths = catalog_csv_paths(data_dir)
+    tables = []
+    for path in paths:
+        catalog = load_catalog_csv(path)
+        tables.append({
+            'name': os.path.basename(path),
+            'key': catalog.key,
+            'matrix': catalog.matrix,
+            'columns': catalog.meta
+        })
+    return write_bundle(os.path.join(data_dir, BUNDLE_DIR_NAME), tables, paths, VECTOR_DIM)
+
+
+# ===== 전체 카탈로그 로드 (서버 시작 시 1회) =====
+@timed("catalog_load")
+def load_catalogs(data_dir=DATA_DIR):
+    paths = catalog_csv_paths(data_dir)
+    bundle = read_bundle(os.path.join(data_dir, BUNDLE_DIR_NAME), paths)
+    catalogs = {}
+    if bundle is not None:
+        meta, vectors, normalized = bundle
+        for table in meta['tables']:
+            matrix, norm, columns = table_arrays(table, vectors, normalized)
+            key = catalog_key(*table['key'])
+            catalogs[key] = LectureCatalog(key, matrix, columns, normalized=norm)
+        print(f"[BOOT] 전공 강의 카탈로그 {len(catalogs)}개 로드 완료 (번들 {meta['version']})")
+        return MajorCatalogs(meta['version'], catalogs)
+
+    for path in paths:
+        catalog = load_catalog_csv(path)
+        catalogs[catalog.key] = catalog
+    version = content_version(paths)
+    print(f"[BOOT] 전공 강의 카탈로그 {len(catalogs)}개 로드 완료 (CSV {version})")
+    return MajorCatalogs(version, catalogs)
+
+
+# ===== 카탈로그 스냅샷 (핫 리로드) =====
+catalog_manager = CatalogManager(
+    "전공",
+    load_catalogs,
+    lambda: catalog_fingerprint(os.path.join(DATA_DIR, BUNDLE_DIR_NAME), catalog_csv_paths())
+)
+
+
+def get_catalogs():
+    """현재 스냅샷. 요청 하나에서는 한 번만 받아서 끝까지 사용할 것"""
+    return catalog_manager.current()
+
+
+def on_reload(callback):
+    """카탈로그가 다시 로드되면 호출할 함수 등록 (예: 추천 결과 캐시 비우기)"""
+    return catalog_manager.on_reload(callback)
+
+
+def reload_catalogs():
+    return catalog_manager.reload()
+
+
+def get_catalog(dept, major, sub=None, catalogs=None):
+    key = catalog_key(dept, major, sub)
+    if catalogs is None:
+        catalogs = get_catalogs()
+    catalog = catalogs.get(key)
+    if catalog is None:
+        raise CatalogNotFound(f"강의 데이터가 없습니다: {key}")
+    return catalog
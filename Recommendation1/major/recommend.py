@@ -0,0 +1,190 @@
+import numpy as np
+from sklearn.preprocessing import normalize
+from common.cache import RecommendationCache, make_key, precomputed_result
+from common.metrics import debug_log, timed
+from .catalog import get_catalog, get_catalogs, on_reload
+from .feature_schema import MAJOR_FEATURES
+
+PROFILE_FIELDS = ('단과대학', '전공', '세부전공', '학년')
+
+# 전공 추천 결과 캐시 (이 엔진을 불러온 프로세스마다 하나)
+recommendation_cache = RecommendationCache()
+
+
+@timed("vectorize")
+def vectorize_user_input(user):
+    # 스키마(feature_schema.py)에 선언된 순서대로 18차원 벡터
+    return MAJOR_FEATURES.vectorize(user["preferences"]["major"])
+
+
+@timed("vectorize")
+def vectorize_user_inputs(users):
+    """여러 사용자 → ((U, 18) 행렬, 선호 정보가 다 있는 사용자 마스크)"""
+    prefs = [(u.get("preferences") or {}).get("major") or {} for u in users]
+    return MAJOR_FEATURES.vectorize_many(prefs)
+
+
+def feature_map(index, value):
+    return MAJOR_FEATURES.reason_label(index, value)
+
+
+def get_top_3_features(user_vec, lecture_vec):
+    # 번들 벡터는 float32라서 0.2 같은 값 비교를 위해 반올림
+    lecture_vec = np.round(np.asarray(lecture_vec, dtype=float), 6)
+    contributions = user_vec * lecture_vec
+    top_indices = np.argsort(contributions)[::-1]
+    reasons = []
+    for i in top_indices:
+        reason = feature_map(i, lecture_vec[i])
+        if reason and reason not in reasons:
+            reasons.append(reason)
+        if len(reasons) == 3:
+            break
+    return reasons
+
+
+# ==================== 이전 수강 과목명 추출 ====================
+def previous_subject_names(previous_courses) -> set:
+    # dict({'과목명': ...}), 튜플(과목명, 교수명), 문자열 모두 허용
+    names = set()
+    for p in previous_courses or []:
+        if isinstance(p, dict):
+            name = p.get('과목명')
+        elif isinstance(p, (tuple, list)):
+            name = p[0] if p else None
+        else:
+            name = p
+        if name:
+            names.add(name)
+    return names
+
+
+# ==================== 추천 함수 ====================
+def catalog_for(profile, catalogs=None):
+    return get_catalog(profile['단과대학'], profile['전공'], profile.get('세부전공'), catalogs)
+
+
+def select_major_lectures(catalog, profile, previous_courses, user_vec, sim) -> list:
+    """유사도(sim, 카탈로그 전체 행 기준)가 계산된 사용자 한 명의 상위 5개 추천"""
+    # === 1. 학년 영역 필터
+    학년_영역 = str(profile['학년']) + "영역"
+    mask = catalog.area_mask(학년_영역)
+
+    # === 2. 과거 수강 과목 제거
+    prev_subjects = previous_subject_names(previous_courses)
+    if prev_subjects:
+        mask = mask & ~np.isin(catalog.meta['과목명'], list(prev_subjects))
+    candidates = np.flatnonzero(mask)
+    # float32 오차(1e-6 미만)는 동점으로 보고 파일 순서 유지
+    ranked = candidates[np.argsort(-np.round(sim[candidates], 6), kind='stable')]
+
+    # === 3. 상위 추천 5개 출력 (과목명 중복 제거)
+    titles = catalog.meta['과목명']
+    seen = set()
+    top_rows = []
+    for i in ranked:
+        if titles[i] in seen:
+            continue
+        seen.add(titles[i])
+        top_rows.append(i)
+        if len(top_rows) == 5:
+            break
+
+    with timed("explain"):
+        recommendations = [{
+            '과목명': titles[i],
+            '교수명': catalog.meta['교수명'][i],
+            '개설학과전공': catalog.meta['개설학과전공'][i],
+            '영역': catalog.meta['영역'][i],
+            '추천 이유': get_top_3_features(user_vec, catalog.matrix[i])
+        } for i in top_rows]
+
+    return recommendations
+
+
+def recommendation_key(profile, user_vec, previous_courses, version):
+    # 같은 카탈로그 버전 + 전공/학년 + 선호 벡터 + 이전 수강 과목이면 결과가 같음
+    return make_key(
+        'major', version,
+        [profile.get(f) for f in PROFILE_FIELDS],
+        user_vec, previous_subject_names(previous_courses)
+    )
+
+
+def recommend_major_lectures(user_input: dict, previous_courses, precomputed=None) -> list:
+    # === 1. 사용자 기본 정보 로드 (profile 맵) → 미리 로드된 카탈로그
+    # 요청 도중 카탈로그가 교체되어도 같은 스냅샷만 사용
+    catalogs = get_catalogs()
+    profile = user_input['profile']
+    catalog = catalog_for(profile, catalogs)
+
+    debug_log("major.recommend", profile=profile, previous_courses=previous_courses)
+
+    # === 2. 같은 조건의 추천 결과가 캐시에 있으면 바로 반환
+    user_vec = vectorize_user_input(user_input)
+    key = recommendation_key(profile, user_vec, previous_courses, catalogs.version)
+    cached = recommendation_cache.get(key)
+    if cached is not None:
+        return cached
+    # 미리 계산된 결과(precompute.py)가 같은 키로 만들어졌으면 그대로 사용
+    stored = precomputed_result(precomputed, 'major', key)
+    if stored is not None:
+        recommendation_cache.set(key, stored)
+        return stored
+
+    # === 3. 유사도 계산 (카탈로그 벡터는 미리 정규화됨)
+    with timed("similarity"):
+        sim = catalog.normalized @ normalize(user_vec.reshape(1, -1))[0]
+    recommendations = select_major_lectures(catalog, profile, previous_courses, user_vec, sim)
+    recommendation_cache.set(key, recommendations)
+    return recommendations
+
+
+# ==================== 일괄 추천 함수 ====================
+def recommend_major_lectures_batch(user_inputs: list, previous_courses_list: list, with_keys=False):
+    """여러 사용자를 전공 카탈로그별로 묶어 (U×F)·(F×N) 행렬곱 한 번으로 유사도 계산.
+    반환: 사용자 순서대로 추천 목록, 해당 전공 카탈로그가 없으면 None.
+    with_keys=True면 (추천 목록들, 결과 키들) — 키는 이 호출이 쓴 카탈로그 스냅샷 기준"""
+    catalogs = get_catalogs()
+    results = [None] * len(user_inputs)
+    result_keys = [None] * len(user_inputs)
+    groups = {}
+    # 선호 설문은 한 번에 벡터화
+    user_vectors, has_prefs = vectorize_user_inputs(user_inputs)
+    for i, user_input in enumerate(user_inputs):
+        try:
+            catalog = catalog_for(user_input['profile'], catalogs)
+        except KeyError:
+            # 카탈로그가 없는 사용자는 건너뜀
+            continue
+        if not has_prefs[i]:
+            # 선호 정보가 빠진 사용자도 건너뜀
+            continue
+        user_vec = user_vectors[i]
+        key = result_keys[i] = recommendation_key(
+            user_input['profile'], user_vec, previous_courses_list[i], catalogs.version)
+        cached = recommendation_cache.get(key)
+        if cached is not None:
+            results[i] = cached
+            continue
+        group = groups.setdefault(catalog.key, (catalog, [], [], []))
+        group[1].append(i)
+        group[2].append(user_vec)
+        group[3].append(key)
+
+    for catalog, indices, vectors, keys in groups.values():
+        user_matrix = np.vstack(vectors)
+        with timed("similarity"):
+            sims = normalize(user_matrix) @ np.asarray(catalog.normalized).T
+        for row, i in enumerate(indices):
+            results[i] = select_major_lectures(
+                catalog, user_inputs[i]['profile'], previous_courses_list[i], user_matrix[row], sims[row]
+            )
+            recommendation_cache.set(keys[row], results[i])
+    if with_keys:
+        return results, result_keys
+    return results
+
+
+# 카탈로그가 바뀌면 이전 버전으로 계산한 결과는 버림
+on_reload(lambda catalogs: recommendation_cache.clear())
@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+from sklearn.preprocessing import normalize
+
+from common.metrics import timed
+
+# ===== 근사 최근접 이웃(IVF) 인덱스 설정 =====
+# exact: 항상 전체 행과 유사도 계산 / ivf: 항상 인덱스 사용 / auto: ANN_MIN_ROWS행 이상일 때만 인덱스
+ANN_MODE = os.getenv("ANN_MODE", "auto")
+ANN_MIN_ROWS = int(os.getenv("ANN_MIN_ROWS", "50000"))
+# 쿼리마다 살펴볼 군집 수 — 클수록 정확(recall↑), 작을수록 빠름(latency↓)
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+ANN_LISTS = int(os.getenv("ANN_LISTS", "0"))          # 0이면 √N개
+ANN_TRAIN_ITERS = 8
+ANN_TRAIN_SAMPLE_PER_LIST = 64                          # 군집당 학습 표본 수
+ASSIGN_CHUNK = 65536
+
+
+class IVFIndex:
+    """정규화된 강의 벡터를 구면 k-means 군집으로 나눠 두고,
+    쿼리와 가까운 nprobe개 군집에 속한 행만 유사도를 계산하게 하는 인덱스"""
+
+    def __init__(self, normalized, n_lists=None, nprobe=ANN_NPROBE, iters=ANN_TRAIN_ITERS, seed=0):
+        vectors = np.asarray(normalized, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        n_rows = len(vectors)
+        n_lists = n_lists or ANN_LISTS or max(1, int(np.sqrt(n_rows)))
+
+        # 학습 표본 (같은 벡터가 많은 카탈로그라 군집 수는 고유 벡터 수를 넘지 않게)
+        sample_size = min(n_rows, n_lists * ANN_TRAIN_SAMPLE_PER_LIST)
+        sample = vectors[np.sort(rng.choice(n_rows, sample_size, replace=False))] if sample_size < n_rows else vectors
+        distinct = np.unique(sample, axis=0)
+        n_lists = max(1, min(n_lists, len(distinct)))
+        centroids = distinct[rng.choice(len(distinct), n_lists, replace=False)]
+
+        for _ in range(iters):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            filled = np.bincount(assign, minlength=n_lists) > 0
+            # 빈 군집은 이전 중심 유지
+            centroids[filled] = normalize(sums[filled])
+
+        self.centroids = centroids
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.assign = np.concatenate([
+            np.argmax(vectors[start:start + ASSIGN_CHUNK] @ centroids.T, axis=1)
+            for start in range(0, n_rows, ASSIGN_CHUNK)
+        ]).astype(np.int32) if n_rows else np.zeros(0, dtype=np.int32)
+        self.list_sizes = np.bincount(self.assign, minlength=n_lists)
+
+    def restrict(self, query, candidates, k, nprobe=None):
+        """candidates 중 쿼리와 가까운 군집에 속한 행만 남김.
+        남은 행이 k개보다 적으면 nprobe를 두 배씩 늘리고, 군집을 다 보면 전체(정확 탐색)와 같다."""
+        nprobe = max(1, nprobe or self.nprobe)
+        if nprobe >= self.n_lists:
+            return candidates
+        order = np.argsort(-(self.centroids @ np.asarray(query, dtype=np.float32)))
+        candidate_lists = self.assign[candidates]
+        while True:
+            chosen = np.zeros(self.n_lists, dtype=bool)
+            chosen[order[:nprobe]] = True
+            picked = candidates[chosen[candidate_lists]]
+            if len(picked) >= k or nprobe >= self.n_lists:
+                return picked
+            nprobe *= 2
+
+    def stats(self):
+        return {
+            "lists": int(self.n_lists),
+            "nprobe": int(self.nprobe),
+            "max_list_size": int(self.list_sizes.max()) if len(self.list_sizes) else 0
+        }
+
+
+def build_index(normalized, mode=None):
+    """모드와 행 수에 따라 IVF 인덱스 또는 None(정확 탐색)"""
+    mode = mode or ANN_MODE
+    if mode == "exact" or len(normalized) == 0:
+        return None
+    if mode == "auto" and len(normalized) < ANN_MIN_ROWS:
+        return None
+    return IVFIndex(normalized)
+
+
+def scored_candidates(table, user_vec, candidates, k, sim=None, nprobe=None):
+    """candidates 중 유사도를 계산할 행과 유사도 배열(카탈로그 전체 행 기준, 계산한 행만 유효).
+    sim이 이미 있으면(일괄 추천) 그대로, 인덱스가 없으면 전체 행 정확 계산."""
+    if sim is not None:
+        return candidates, sim
+    with timed("similarity"):
+        query = normalize(user_vec.reshape(1, -1))[0]
+        index = getattr(table, 'index', None)
+        if index is None:
+            return candidates, table.normalized @ query
+        candidates = index.restrict(query, candidates, k, nprobe)
+        sim = np.empty(len(table))
+        sim[candidates] = np.asarray(table.normalized[candidates]) @ query
+        return candidates, sim
@@ -0,0 +1,11 @@
+# 강의 벡터·필수추천 CSV → 바이너리 번들(data/bundle) 컴파일
+# 사용법: python build_catalog.py [데이터 폴더]
+import sys
+
+from catalog import DATA_DIR, build_bundle
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else DATA_DIR
+    meta = build_bundle(data_dir)
+    rows = sum(t['rows'] for t in meta['tables'])
+    print(f"✅ 번들 생성 완료: 테이블 {len(meta['tables'])}개, 강의 {rows}개, 버전 {meta['version']}")
@@ -0,0 +1,255 @@
+import ast
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import normalize
+
+from common.bundle import (
+    BUNDLE_DIR_NAME, catalog_fingerprint, content_version, read_bundle, table_arrays, write_bundle
+)
+from common.catalog_manager import CatalogManager
+from common.metrics import timed
+from ann import build_index
+from feature_schema import LIBERAL_FEATURES
+
+# ===== 카탈로그 설정 =====
+DATA_DIR = os.getenv("CATALOG_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+VECTOR_DIM = 20
+LECTURE_FILES = {
+    'liberal': "강의_벡터화_일반교양.csv",
+    'career': "강의_벡터화_진로소양.csv"
+}
+LECTURE_COLUMNS = ['과목명', '교수명', '이수구분', '영역']
+REQUIRED_PREFIX = "필수추천_"
+
+# ===== 1학년 필수추천 =====
+# 그룹 전공은 필수추천_1/2/3.csv 하나를 전공명으로 나눠 쓰고, 나머지 전공은 필수추천_{전공}.csv를 통째로 사용
+REQUIRED_GROUPS = {
+    '1': ['영어영문학과','일본어문·문화학과','독일어문·문화학과','프랑스어문·문화학과','중국어문·문화학과','법학과','국어국문학과','사학과'],
+    '2': ['정치외교학과','지리학과','경영학과','미디어커뮤니케이션학과','심리학과','동양화과','서양화과','조소과','성악과','기악과','작곡과','스포츠과학학부','공예과','디자인과','경제학과'],
+    '3': ['사회복지학과','의류산업학과','소비자산업학과','문화예술경영학과','현대실용음악학과','무용예술학과','간호학과','뷰티산업학과','미디어영상연기학과']
+}
+PYTHON_COURSE = '파이썬프로그래밍'        # 그룹3은 전공과 상관없이 함께 추천
+REQUIRED_COLUMNS = ['과목명', '교수명', '이수구분', '영역', '추천이유']
+DEFAULT_REQUIRED_REASON = '전공 필수 추천'
+
+
+def title_key(title):
+    """과목명 비교용 키 (앞뒤 공백 제거 + 소문자)"""
+    return str(title).strip().lower()
+
+
+class LectureTable:
+    """교양/진로소양 강의 목록: 벡터 행렬 + 컬럼별 메타데이터 배열"""
+
+    def __init__(self, name, matrix, meta, normalized=None):
+        self.name = name
+        self.matrix = matrix                    # (N, 20) 원본 벡터 (추천 이유 해석용)
+        # 코사인 유사도용 정규화 벡터 (번들에서는 mmap으로 공유)
+        self.normalized = normalize(matrix) if normalized is None else normalized
+        self.meta = meta                        # {컬럼명: np.ndarray}
+        # 추천 이유 코드표 (N, 20)와 (과목명, 교수명) 쌍 번호 — 요청마다 다시 계산하지 않음
+        self.reason_codes, self.reason_labels = LIBERAL_FEATURES.reason_codes(matrix)
+        self.pair_ids = pd.DataFrame({'과목명': meta['과목명'], '교수명': meta['교수명']}) \
+            .groupby(['과목명', '교수명'], sort=False, dropna=False).ngroup().to_numpy()
+        # 과목명 키 → 정수 과목 번호: 이전 수강/필수추천 제외는 번호 마스크로 (요청마다 문자열 정규화 없음)
+        self.title_keys = np.array([title_key(t) for t in meta['과목명']], dtype=object)
+        ids, keys = pd.factorize(self.title_keys)
+        self.title_ids = ids
+        self.title_index = {k: i for i, k in enumerate(keys)}
+        # 공백을 뺀 이수구분 ('공통 교양' → '공통교양')
+        self.이수구분 = np.array([re.sub(r"\s+", "", str(x).strip()) for x in meta['이수구분']], dtype=object)
+        self.common_mask = self.이수구분 == '공통교양'
+        self._contains = {}
+        # 큰 카탈로그면 근사 최근접 이웃 인덱스 (작으면 None → 정확 탐색)
+        self.index = build_index(self.normalized)
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def title_mask(self, keys):
+        """과목명 키 집합에 해당하는 행 마스크 (카탈로그에 없는 키는 무시)"""
+        ids = [self.title_index[k] for k in keys if k in self.title_index]
+        hit = np.zeros(len(self.title_index), dtype=bool)
+        hit[ids] = True
+        return hit[self.title_ids]
+
+    def rows_containing(self, text):
+        """과목명 키에 text가 들어 있는 행 번호 (글자별로 한 번만 계산)"""
+        rows = self._contains.get(text)
+        if rows is None:
+            rows = np.flatnonzero([text in t for t in self.title_keys])
+            self._contains[text] = rows
+        return rows
+
+
+class Catalog:
+    """서비스 전체 카탈로그: 교양, 진로소양, 필수추천 테이블"""
+
+    def __init__(self, version, liberal, career, required):
+        self.version = version
+        self.liberal = liberal
+        self.career = career
+        self.required = required                # {'1': DataFrame, 'AI융합학부': DataFrame, ...}
+        # {전공: 필수추천 레코드 목록} — 요청 때는 dict 조회 한 번
+        self.required_by_major, self.required_problems = build_required_index(required)
+
+
+# ===== 전공별 필수추천 레코드 (카탈로그 로드 시 1회) =====
+def _required_records(name, df, problems):
+    missing = [col for col in REQUIRED_COLUMNS[:-1] if col not in df.columns]
+    if missing:
+        problems.append(f"{REQUIRED_PREFIX}{name}.csv: 컬럼 없음 {missing}")
+        return []
+    df = df.copy()
+    if '추천이유' not in df.columns:
+        df['추천이유'] = DEFAULT_REQUIRED_REASON
+    records = df[REQUIRED_COLUMNS].astype(object)
+    # 빈 칸은 NaN 대신 None (응답 JSON에 그대로 쓸 수 있게)
+    return records.where(records.notna(), None).to_dict('records')
+
+
+def build_required_index(required):
+    """그룹 규칙(전공명 필터, 그룹3 파이썬프로그래밍)을 미리 적용한 {전공: 레코드 목록}과 문제 목록"""
+    index = {}
+    problems = []
+    grouped = set()
+    for group, majors in REQUIRED_GROUPS.items():
+        grouped.update(majors)
+        df = required.get(group)
+        if df is None:
+            problems.append(f"{REQUIRED_PREFIX}{group}.csv 없음: {', '.join(majors)} 필수추천 불가")
+            continue
+        if group != '3' and '전공명' not in df.columns:
+            problems.append(f"{REQUIRED_PREFIX}{group}.csv: 전공명 컬럼 없음")
+            continue
+        for major in majors:
+            if group == '3':
+                rows = df[(df.get('전공명', major) == major) | (df['과목명'] == PYTHON_COURSE)]
+            else:
+                rows = df[df['전공명'] == major]
+            if '전공명' in df.columns and not (df['전공명'] == major).any():
+                problems.append(f"{REQUIRED_PREFIX}{group}.csv: {major} 행 없음")
+            index[major] = _required_records(group, rows, problems)
+
+    for name, df in required.items():
+        if name in REQUIRED_GROUPS or name in grouped:
+            continue
+        index[name] = _required_records(name, df, problems)
+
+    for problem in problems:
+        print(f"[WARN] {problem}")
+    return index, problems
+
+
+def required_csv_paths(data_dir=DATA_DIR):
+    return sorted(glob.glob(os.path.join(data_dir, f"{REQUIRED_PREFIX}*.csv")))
+
+
+def catalog_source_paths(data_dir=DATA_DIR):
+    lecture_paths = [os.path.join(data_dir, f) for f in LECTURE_FILES.values()]
+    return lecture_paths + required_csv_paths(data_dir)
+
+
+def required_name(path):
+    # 필수추천_{이름}.csv → 이름
+    return os.path.splitext(os.path.basename(path))[0][len(REQUIRED_PREFIX):]
+
+
+# ===== 벡터 문자열 파싱 (깨진 행은 None) =====
+def parse_vector(value, dim):
+    try:
+        vector = ast.literal_eval(value)[:dim]
+    except (ValueError, SyntaxError, TypeError):
+        return None
+    return vector if len(vector) == dim else None
+
+
+def _object_columns(df, columns):
+    # NaN(빈 칸)은 None으로 통일
+    return {col: df[col].astype(object).where(df[col].notna(), None).to_numpy() for col in columns}
+
+
+# ===== CSV 로드 =====
+def load_lecture_csv(path):
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    vectors = [parse_vector(v, VECTOR_DIM) for v in df['전체 벡터']]
+    valid = np.array([v is not None for v in vectors], dtype=bool)
+    if not valid.all():
+        print(f"[WARN] {os.path.basename(path)}: 벡터가 깨진 {int((~valid).sum())}개 행 제외")
+        df = df[valid]
+        vectors = [v for v in vectors if v is not None]
+    matrix = np.array(vectors, dtype=float).reshape(len(df), VECTOR_DIM)
+    return LectureTable(os.path.basename(path), matrix, _object_columns(df, LECTURE_COLUMNS))
+
+
+def load_required_csv(path):
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    return pd.DataFrame(_object_columns(df, list(df.columns)))
+
+
+# ===== 번들 빌드 (python build_catalog.py) =====
+def build_bundle(data_dir=DATA_DIR):
+    tables = []
+    for name, filename in LECTURE_FILES.items():
+        table = load_lecture_csv(os.path.join(data_dir, filename))
+        tables.append({'name': name, 'key': None, 'matrix': table.matrix, 'columns': table.meta})
+    for path in required_csv_paths(data_dir):
+        df = load_required_csv(path)
+        tables.append({
+            'name': REQUIRED_PREFIX + required_name(path),
+            'key': None,
+            'matrix': None,
+            'columns': {col: df[col].tolist() for col in df.columns}
+        })
+    return write_bundle(os.path.join(data_dir, BUNDLE_DIR_NAME), tables, catalog_source_paths(data_dir), VECTOR_DIM)
+
+
+# ===== 전체 카탈로그 로드 (서버 시작 시 1회) =====
+@timed("catalog_load")
+def load_catalog(data_dir=DATA_DIR):
+    paths = catalog_source_paths(data_dir)
+    bundle = read_bundle(os.path.join(data_dir, BUNDLE_DIR_NAME), paths)
+    if bundle is not None:
+        meta, vectors, normalized = bundle
+        lectures, required = {}, {}
+        for table in meta['tables']:
+            matrix, norm, columns = table_arrays(table, vectors, normalized)
+            if table['name'].startswith(REQUIRED_PREFIX):
+                required[table['name'][len(REQUIRED_PREFIX):]] = pd.DataFrame(columns)
+            else:
+                lectures[table['name']] = LectureTable(table['name'], matrix, columns, normalized=norm)
+        print(f"[BOOT] 교양/진로소양 카탈로그 로드 완료 (번들 {meta['version']})")
+        return Catalog(meta['version'], lectures['liberal'], lectures['career'], required)
+
+    liberal = load_lecture_csv(os.path.join(data_dir, LECTURE_FILES['liberal']))
+    career = load_lecture_csv(os.path.join(data_dir, LECTURE_FILES['career']))
+    required = {required_name(path): load_required_csv(path) for path in required_csv_paths(data_dir)}
+    version = content_version(paths)
+    print(f"[BOOT] 교양/진로소양 카탈로그 로드 완료 (CSV {version})")
+    return Catalog(version, liberal, career, required)
+
+
+# ===== 카탈로그 스냅샷 (핫 리로드) =====
+catalog_manager = CatalogManager(
+    "교양/진로소양",
+    load_catalog,
+    lambda: catalog_fingerprint(os.path.join(DATA_DIR, BUNDLE_DIR_NAME), catalog_source_paths())
+)
+
+
+def get_catalog():
+    """현재 스냅샷. 요청 하나에서는 한 번만 받아서 끝까지 사용할 것"""
+    return catalog_manager.current()
+
+
+def on_reload(callback):
+    """카탈로그가 다시 로드되면 호출할 함수 등록 (예: 추천 결과 캐시 비우기)"""
+    return catalog_manager.on_reload(callback)
+
+
+def reload_catalog():
+    return catalog_manager.reload()
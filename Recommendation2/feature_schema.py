@@ -0,0 +1,34 @@
+from common.features import Bucket, Decode, FeatureSchema, Keyword, Mapping, OneHot
+
+# ===== 교양/진로소양 선호도 벡터 (20차원) =====
+# 시험 + 과제 + 조모임 + 출결(5) + 성적(4) + 강의시간 + 강의력 + 수업유형(3, 가중치 3) + 캠퍼스(2) + 평점
+# 강의_벡터화_일반교양.csv / 진로소양.csv의 '전체 벡터'와 같은 순서
+
+EXAM_RULES = [(('없',), 0.2), (('한',), 0.4), (('두',), 0.6), (('세',), 0.8), (('네', '4'), 1.0)]
+AMOUNT_RULES = [(('많',), 1.0), (('없',), 0.0)]
+
+
+def amount_decode(prefix):
+    return Decode([('==', 1, f'{prefix} 많음'), ('==', 0, f'{prefix} 없음')], default=f'{prefix} 보통/모름')
+
+
+LIBERAL_FEATURES = FeatureSchema([
+    Keyword('시험', EXAM_RULES, default=0.4, divide=3, decode=Decode([
+        ('==', 0.2, '시험 없음'), ('==', 0.4, '시험 1번'), ('==', 0.6, '시험 2번'), ('==', 0.8, '시험 3번')
+    ], default='시험 4번 이상')),
+    Keyword('과제', AMOUNT_RULES, default=0.5, decode=amount_decode('과제')),
+    Keyword('조모임', AMOUNT_RULES, default=0.5, decode=amount_decode('조모임')),
+    OneHot('출결', ['전자출결', '직접호명', '모름', '복합적', '반영안함']),
+    OneHot('성적', ['너그러움', '보통', '모름', '깐깐함']),
+    Mapping('강의시간', {'풀강': 1.0}, default=0.0,
+            decode=Decode([('==', 1, '풀강'), ('==', 0, '풀강X')], default='모름')),
+    Mapping('강의력', {'좋음': 1.0, '보통': 0.5, '나쁨': 0.0}, default=0.5,
+            decode=Decode([('==', 1, '강의력 좋음'), ('==', 0, '강의력 나쁨')], default='강의력 보통/모름')),
+    OneHot('수업유형', ['블렌디드', '원격', '일반'], weight=3, reason_divide=3),
+    OneHot('캠퍼스', ['수정', '운정'], labels=['수정캠퍼스', '운정캠퍼스']),
+    Bucket('평점', [(float('-inf'), 1.0, 'right', 0.1), (1.0, 2.0, 'right', 0.2),
+                  (2.0, 3.0, 'right', 0.3), (3.0, 4.0, 'right', 0.4)],
+           default=0.5, decode=Decode([
+               ('<=', 0.2, '평점 ≤ 2'), ('<=', 0.3, '평점 ≤ 3'), ('<=', 0.4, '평점 ≤ 4')
+           ], default='평점 ≤ 5', divide=2)),
+])
@@ -1,12 +1,24 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from common.metrics import timed
+from common.storage import get_storage
+from common.cache import PRECOMPUTED_COLLECTION, PRECOMPUTED_DOC_ID
+from common.write_behind import WriteBehindQueue
 
-# Firebase 초기화
-cred = credentials.Certificate("firebase_key.json")  # 서비스 계정 키 json
-firebase_admin.initialize_app(cred)
-db = firestore.client()
+BATCH_WRITE_LIMIT = 500  # Firestore 배치 쓰기 최대 연산 수
+FETCH_WORKERS = 16
+
+# Firestore 읽기를 동시에 보내기 위한 공용 스레드 풀 (크기 제한)
+io_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+
+# Firebase 초기화 (STORAGE_BACKEND=memory/sqlite면 로컬 저장소, common/storage.py)
+db = get_storage("firebase_key.json")  # 서비스 계정 키 json
+
+# 추천 결과 쓰기는 동시에 들어온 것끼리 배치로 (common/write_behind.py, 실패하면 다음 flush에서 재시도)
+write_queue = WriteBehindQueue(db, timed)
 
 # 사용자 정보 불러오기 (profile + preferences 포함)
+@timed("firestore_read")
 def fetch_user_info(user_id):
     doc = db.collection("users").document(user_id).get()
     if doc.exists:
@@ -14,16 +26,41 @@ def fetch_user_info(user_id):
     return None
 
 
-# 추천 결과 저장 (liberal + career 추천 결과)
+# 추천 결과 저장 (liberal + career 추천 결과, 쓰기 큐에 넣고 바로 돌아감 — 응답 본문에 결과가 그대로 담김)
 def save_recommendation_to_firebase(user_id, doc_id, liberal_results, career_results):
     result_ref = db.collection("users").document(user_id).collection("results").document(doc_id)
-    result_ref.set({
+    write_queue.set(result_ref, {
+        "liberalRecommendations": liberal_results,
+        "careerRecommendations": career_results
+    }, merge=True)
+
+
+# 통합 추천 결과 저장 (전공 + 교양 + 진로소양을 문서 쓰기 한 번으로, 쓰기 큐에 넣고 바로 돌아감)
+def save_all_recommendations_to_firebase(user_id, doc_id, major_results, liberal_results, career_results):
+    result_ref = db.collection("users").document(user_id).collection("results").document(doc_id)
+    write_queue.set(result_ref, {
+        "createdAt": datetime.now().isoformat(),
+        "majorRecommendations": major_results,
         "liberalRecommendations": liberal_results,
         "careerRecommendations": career_results
     }, merge=True)
 
 
+# 미리 계산된 추천 결과 (precompute.py가 저장, 없으면 None)
+@timed("firestore_read")
+def fetch_precomputed(user_id):
+    doc = db.collection("users").document(user_id).collection(PRECOMPUTED_COLLECTION).document(PRECOMPUTED_DOC_ID).get()
+    return doc.to_dict() if doc.exists else None
+
+
+# 사용자 정보 + 이전 수강 강의 + 미리 계산된 추천을 동시에 불러오기 (Firestore 왕복 1번 시간)
+def fetch_recommend_inputs(user_id):
+    futures = [io_pool.submit(fn, user_id) for fn in (fetch_user_info, fetch_previous_courses, fetch_precomputed)]
+    return tuple(f.result() for f in futures)
+
+
 # 이전 수강 강의 불러오기
+@timed("firestore_read")
 def fetch_previous_courses(user_id):
     courses_ref = db.collection("users").document(user_id).collection("previous_courses")
     docs = courses_ref.stream()
@@ -34,3 +71,46 @@ def fetch_previous_courses(user_id):
         if course_key:
             previous_courses.add(course_key)
     return previous_courses
+
+
+# ===== 여러 사용자 일괄 처리 =====
+def stream_users():
+    """users 컬렉션 전체 → (user_id, 문서) (미리 계산 작업용)"""
+    for doc in db.collection("users").stream():
+        yield doc.id, doc.to_dict()
+
+
+@timed("firestore_read")
+def fetch_user_infos(user_ids):
+    refs = [db.collection("users").document(uid) for uid in user_ids]
+    docs = {doc.id: doc.to_dict() for doc in db.get_all(refs) if doc.exists}
+    return {uid: docs.get(uid) for uid in user_ids}
+
+
+def fetch_previous_courses_many(user_ids):
+    return dict(zip(user_ids, io_pool.map(fetch_previous_courses, user_ids)))
+
+
+@timed("firestore_write")
+def save_recommendations_batch(items):
+    """items: [(user_id, doc_id, liberal_results, career_results)]"""
+    for start in range(0, len(items), BATCH_WRITE_LIMIT):
+        batch = db.batch()
+        for user_id, doc_id, liberal_results, career_results in items[start:start + BATCH_WRITE_LIMIT]:
+            result_ref = db.collection("users").document(user_id).collection("results").document(doc_id)
+            batch.set(result_ref, {
+                "liberalRecommendations": liberal_results,
+                "careerRecommendations": career_results
+            }, merge=True)
+        batch.commit()
+
+
+@timed("firestore_write")
+def save_precomputed_batch(items):
+    """items: [(user_id, 문서 필드)] → users/{uid}/precomputed/latest (배치당 최대 500명)"""
+    for start in range(0, len(items), BATCH_WRITE_LIMIT):
+        batch = db.batch()
+        for user_id, fields in items[start:start + BATCH_WRITE_LIMIT]:
+            doc_ref = db.collection("users").document(user_id).collection(PRECOMPUTED_COLLECTION).document(PRECOMPUTED_DOC_ID)
+            batch.set(doc_ref, fields)
+        batch.commit()
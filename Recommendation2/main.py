@@ -2,11 +2,38 @@ from fastapi import FastAPI
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from recommender import recommend_combined, recommend_career, vectorize_user_input
-from firebase_utils import fetch_user_info, save_recommendation_to_firebase, fetch_previous_courses
+from typing import List
+from recommender import (
+    recommend_combined, recommend_career, vectorize_user_input, vectorize_user_inputs, recommend_batch,
+    recommendation_cache
+)
+from firebase_utils import (
+    fetch_recommend_inputs, save_recommendation_to_firebase, save_all_recommendations_to_firebase, write_queue,
+    fetch_user_infos, fetch_previous_courses_many, save_recommendations_batch
+)
+from catalog import get_catalog, catalog_manager
+from major_engine import load_major_engine
+from common.metrics import install_metrics
+from concurrent.futures import ThreadPoolExecutor
 import math
+import os
+
+MAX_BATCH_USERS = 1000
+
+# 통합 추천에서 전공/진로소양 추천을 동시에 돌릴 스레드 풀 (교양은 요청 스레드에서 직접 계산).
+# 요청 하나가 작업 2개를 넣으므로 동시에 들어오는 통합 추천 요청 수(RECOMMEND_CONCURRENCY)의 두 배로 잡아
+# 다른 요청의 작업 뒤에 줄 서지 않게 한다. 기본 40은 FastAPI 동기 엔드포인트 스레드 풀 크기와 같음
+RECOMMEND_CONCURRENCY = int(os.getenv("RECOMMEND_CONCURRENCY", "40"))
+recommend_pool = ThreadPoolExecutor(max_workers=max(1, RECOMMEND_CONCURRENCY) * 2, thread_name_prefix="recommend")
 
 app = FastAPI()
+install_metrics(app)
+
+# 서버 시작 시 교양/진로소양/필수추천 카탈로그 미리 로드
+get_catalog()
+
+# 통합 추천용 전공 추천 엔진 (Recommendation1 카탈로그도 미리 로드, 비활성/실패 시 None)
+major_engine = load_major_engine()
 
 print("[BOOT] FastAPI 시작됨")
 
@@ -14,6 +41,10 @@ class UserID(BaseModel):
     user_id: str
     doc_id: str
 
+class BatchRequest(BaseModel):
+    users: List[UserID]
+    save: bool = True
+
 def replace_nan_with_none(obj):
     """NaN → None 재귀 치환 함수"""
     if isinstance(obj, float) and math.isnan(obj):
@@ -29,13 +60,52 @@ def replace_nan_with_none(obj):
 def read_root():
     return {"message": "liberal-career recommender API is live 🚀"}
 
+@app.get("/cache/stats")
+def cache_stats():
+    return recommendation_cache.stats()
+
+# 카탈로그 파일이 바뀌면 재배포 없이 교체 (CATALOG_WATCH_INTERVAL초마다 확인)
+@app.on_event("startup")
+def start_catalog_watcher():
+    catalog_manager.start()
+    if major_engine is not None:
+        major_engine.start()
+    write_queue.start()
+
+# 종료 전에 쌓여 있는 추천 결과 쓰기를 모두 보냄
+@app.on_event("shutdown")
+def stop_catalog_watcher():
+    catalog_manager.stop()
+    if major_engine is not None:
+        major_engine.stop()
+    write_queue.stop()
+
+@app.get("/admin/catalog")
+def catalog_status():
+    catalog = get_catalog()
+    status = catalog_manager.status()
+    status["lectures"] = {"liberal": len(catalog.liberal), "career": len(catalog.career)}
+    status["required"] = sorted(catalog.required)
+    status["required_majors"] = len(catalog.required_by_major)
+    status["required_problems"] = catalog.required_problems
+    status["index"] = {
+        name: table.index.stats() if table.index is not None else "exact"
+        for name, table in (("liberal", catalog.liberal), ("career", catalog.career))
+    }
+    status["major"] = major_engine.status() if major_engine is not None else "disabled"
+    return status
+
+@app.get("/admin/writes")
+def write_status():
+    return write_queue.stats()
+
 @app.post("/recommend/liberal-career")
 def recommend_courses(user: UserID):
     user_id = user.user_id
     doc_id = user.doc_id
     
-    # 사용자 profile + preferences 불러오기
-    user_doc = fetch_user_info(user_id)
+    # 사용자 profile + preferences, 이전 수강 강의, 미리 계산된 추천을 동시에 불러오기
+    user_doc, previous_titles, precomputed = fetch_recommend_inputs(user_id)
     if not user_doc:
         raise HTTPException(status_code=404, detail="사용자 정보를 찾을 수 없습니다.")
 
@@ -45,8 +115,7 @@ def recommend_courses(user: UserID):
     if not profile or not liberal_pref:
         raise HTTPException(status_code=400, detail="profile 또는 liberal 선호 정보가 없습니다.")
 
-     # 이전 수강 강의 Firebase에서 불러오기
-    previous_courses = [{"과목명": name} for name in fetch_previous_courses(user_id)]
+    previous_courses = [{"과목명": name} for name in previous_titles]
 
     # 사용자 선호 벡터화
     user_input = {
@@ -57,11 +126,13 @@ def recommend_courses(user: UserID):
     }
     user_vector = vectorize_user_input(user_input)
 
-    # 추천 수행 (profile = 단과대학, 전공, 세부전공, 학년 포함)
-    liberal_results = recommend_combined(user_input, user_vector, previous_courses)
-    career_results = recommend_career(user_input, user_vector, previous_courses)
+    # 추천 수행 (profile = 단과대학, 전공, 세부전공, 학년 포함) — 두 추천 모두 같은 카탈로그 스냅샷 사용
+    # 선호/수강 이력/카탈로그 버전이 미리 계산할 때와 같으면 저장된 결과 사용
+    catalog = get_catalog()
+    liberal_results = recommend_combined(user_input, user_vector, previous_courses, catalog=catalog, precomputed=precomputed)
+    career_results = recommend_career(user_input, user_vector, previous_courses, catalog=catalog, precomputed=precomputed)
 
-    # 결과 저장
+    # 결과 저장은 쓰기 큐로 (같은 문서는 마지막 결과만, 배치로 모아서 저장하고 실패하면 재시도)
     save_recommendation_to_firebase(user_id, doc_id, liberal_results, career_results)
 
     # NaN 제거 후 반환
@@ -72,3 +143,98 @@ def recommend_courses(user: UserID):
         "liberal_recommendations": safe_liberal,
         "career_recommendations": safe_career
     })
+
+@app.post("/recommend/batch")
+def recommend_courses_batch(request: BatchRequest):
+    if len(request.users) > MAX_BATCH_USERS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_USERS}명까지 요청할 수 있습니다.")
+    doc_ids = {u.user_id: u.doc_id for u in request.users}
+    user_ids = list(doc_ids)
+
+    # 사용자 정보 + 이전 수강 강의 일괄 로드
+    user_docs = fetch_user_infos(user_ids)
+    errors = {}
+    user_inputs = {}
+    for uid in user_ids:
+        user_doc = user_docs.get(uid)
+        if not user_doc:
+            errors[uid] = "사용자 정보를 찾을 수 없습니다."
+            continue
+        profile = user_doc.get("profile", {})
+        liberal_pref = user_doc.get("preferences", {}).get("liberal", {})
+        if not profile or not liberal_pref:
+            errors[uid] = "profile 또는 liberal 선호 정보가 없습니다."
+            continue
+        user_inputs[uid] = {"profile": profile, "preferences": {"liberal": liberal_pref}}
+
+    # 사용자 선호 벡터화 (U×F 행렬, 한 번에)
+    input_ids = list(user_inputs)
+    user_matrix, complete = vectorize_user_inputs([user_inputs[uid] for uid in input_ids])
+    for uid, ok in zip(input_ids, complete):
+        if not ok:
+            errors[uid] = "liberal 선호 정보가 불완전합니다."
+    valid_ids = [uid for uid, ok in zip(input_ids, complete) if ok]
+    user_matrix = user_matrix[complete]
+    previous = fetch_previous_courses_many(valid_ids)
+
+    results = {}
+    save_items = []
+    if valid_ids:
+        prev_lectures_list = [[{"과목명": name} for name in previous[uid]] for uid in valid_ids]
+        batch_results = recommend_batch([user_inputs[uid] for uid in valid_ids], user_matrix, prev_lectures_list)
+        for uid, (liberal_results, career_results) in zip(valid_ids, batch_results):
+            save_items.append((uid, doc_ids[uid], liberal_results, career_results))
+            results[uid] = {
+                "liberal_recommendations": replace_nan_with_none(liberal_results),
+                "career_recommendations": replace_nan_with_none(career_results)
+            }
+
+    # 결과 일괄 저장
+    if request.save and save_items:
+        save_recommendations_batch(save_items)
+
+    return jsonable_encoder({"results": results, "errors": errors})
+
+@app.post("/recommend/all")
+def recommend_all(user: UserID):
+    """전공 + 교양 + 진로소양 한 번에: 사용자 정보는 한 번만 읽고, 결과도 문서 쓰기 한 번으로 저장"""
+    if major_engine is None:
+        raise HTTPException(status_code=503, detail="전공 추천 엔진이 비활성 상태입니다.")
+    user_id = user.user_id
+    doc_id = user.doc_id
+
+    user_doc, previous_titles, precomputed = fetch_recommend_inputs(user_id)
+    if not user_doc:
+        raise HTTPException(status_code=404, detail="사용자 정보를 찾을 수 없습니다.")
+
+    profile = user_doc.get("profile", {})
+    preferences = user_doc.get("preferences", {})
+    major_pref = preferences.get("major", {})
+    liberal_pref = preferences.get("liberal", {})
+    if not profile or not major_pref or not liberal_pref:
+        raise HTTPException(status_code=400, detail="profile 또는 major/liberal 선호 정보가 없습니다.")
+
+    previous_courses = [{"과목명": name} for name in previous_titles]
+    major_input = {"profile": profile, "preferences": {"major": major_pref}}
+    liberal_input = {"profile": profile, "preferences": {"liberal": liberal_pref}}
+    liberal_vector = vectorize_user_input(liberal_input)
+
+    # 세 추천을 동시에 (교양/진로소양은 같은 카탈로그 스냅샷, 전공은 요청 안에서 스냅샷 하나)
+    catalog = get_catalog()
+    major_future = recommend_pool.submit(major_engine.recommend_major, major_input, previous_courses, precomputed)
+    career_future = recommend_pool.submit(
+        recommend_career, liberal_input, liberal_vector, previous_courses, None, catalog, precomputed)
+    liberal_results = recommend_combined(liberal_input, liberal_vector, previous_courses, None, catalog, precomputed)
+    career_results = career_future.result()
+    try:
+        major_results = major_future.result()
+    except major_engine.CatalogNotFound:
+        raise HTTPException(status_code=404, detail="해당 전공의 강의 정보가 없습니다.")
+
+    save_all_recommendations_to_firebase(user_id, doc_id, major_results, liberal_results, career_results)
+
+    return jsonable_encoder({
+        "major_recommendations": replace_nan_with_none(major_results),
+        "liberal_recommendations": replace_nan_with_none(liberal_results),
+        "career_recommendations": replace_nan_with_none(career_results)
+    })
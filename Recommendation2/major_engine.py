@@ -0,0 +1,68 @@
+import importlib
+import os
+import sys
+
+# ===== 전공 추천 엔진 (Recommendation1) =====
+# 통합 추천(/recommend/all)은 전공 + 교양 + 진로소양을 한 프로세스에서 계산한다.
+# 전공 엔진은 Recommendation1의 major 패키지(major.catalog, major.recommend)로 묶여 있어서
+# Recommendation1 폴더를 sys.path 뒤쪽에 한 번 추가하고 그대로 불러온다 (이 서비스 모듈과 이름이 겹치지 않음).
+# 전공 카탈로그 폴더는 MAJOR_CATALOG_DATA_DIR (없으면 Recommendation1/data).
+# 전공 엔진도 공용 common.metrics를 쓰므로 이 서비스의 /metrics 히스토그램에 같이 기록됨.
+# MAJOR_SERVICE_DIR을 빈 값으로 두면 전공 엔진을 불러오지 않음 (통합 추천 비활성)
+MAJOR_SERVICE_DIR = os.getenv(
+    "MAJOR_SERVICE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Recommendation1")
+)
+
+class MajorEngine:
+    """Recommendation1의 major.catalog/major.recommend 모듈을 감싼 전공 추천기"""
+
+    def __init__(self, catalog, recommend):
+        self.catalog = catalog
+        self.recommend = recommend
+        self.CatalogNotFound = catalog.CatalogNotFound
+
+    def recommend_major(self, user_input, previous_courses, precomputed=None):
+        return self.recommend.recommend_major_lectures(user_input, previous_courses, precomputed)
+
+    def recommend_major_batch(self, user_inputs, previous_courses_list):
+        """일괄 전공 추천 → 사용자 순서대로 (추천 목록, 결과 키). 추천할 수 없는 사용자는 (None, None)"""
+        # 키는 추천과 같은 카탈로그 스냅샷/벡터로 만든 것을 그대로 받음 (중간에 리로드되어도 버전이 맞음)
+        results, keys = self.recommend.recommend_major_lectures_batch(
+            user_inputs, previous_courses_list, with_keys=True)
+        return [
+            (result, key) if result is not None else (None, None)
+            for result, key in zip(results, keys)
+        ]
+
+    def start(self):
+        self.catalog.catalog_manager.start()
+
+    def stop(self):
+        self.catalog.catalog_manager.stop()
+
+    def status(self):
+        status = self.catalog.catalog_manager.status()
+        status["catalogs"] = len(self.catalog.get_catalogs())
+        return status
+
+
+def _import_engine(service_dir):
+    if service_dir not in sys.path:
+        sys.path.append(service_dir)
+    return importlib.import_module("major.catalog"), importlib.import_module("major.recommend")
+
+
+def load_major_engine(service_dir=MAJOR_SERVICE_DIR):
+    """전공 엔진 로드 + 카탈로그 미리 로드. 비활성이거나 실패하면 None"""
+    if not service_dir:
+        return None
+    try:
+        catalog, recommend = _import_engine(service_dir)
+        engine = MajorEngine(catalog, recommend)
+        catalog.get_catalogs()
+    except Exception as e:
+        print(f"[WARN] 전공 추천 엔진 로드 실패 ({service_dir}): {e} — 통합 추천 비활성")
+        return None
+    print(f"[BOOT] 전공 추천 엔진 로드 완료 ({service_dir})")
+    return engine
@@ -0,0 +1,111 @@
+# 전체 사용자 추천 미리 계산 (수강신청 기간처럼 요청이 몰리기 전에 실행)
+# 사용법: python precompute.py [--chunk 500] [--dry-run]
+# users 문서를 chunk명씩 읽어 전공/교양/진로소양 추천을 일괄(행렬곱) 계산하고
+# users/{uid}/precomputed/latest에 배치 쓰기로 저장한다.
+# API는 요청의 캐시 키(카탈로그 버전 + 프로필 + 선호 벡터 + 이전 수강 과목)가 stamps와 같으면 저장된 결과를 그대로 응답한다.
+import argparse
+import itertools
+import time
+from datetime import datetime
+
+from common.cache import PRECOMPUTED_FIELDS
+from catalog import get_catalog
+from firebase_utils import fetch_previous_courses_many, save_precomputed_batch, stream_users
+from major_engine import load_major_engine
+from recommender import recommend_batch, recommendation_key, vectorize_user_inputs
+
+PROFILE_REQUIRED = ('단과대학', '전공', '학년')
+DEFAULT_CHUNK = 500
+
+
+def complete_profile(user_doc):
+    profile = (user_doc or {}).get("profile") or {}
+    return all(profile.get(field) is not None for field in PROFILE_REQUIRED)
+
+
+def precompute_liberal(user_docs, previous, catalog):
+    """교양 + 진로소양 → {uid: {'liberal': (결과, 키), 'career': (결과, 키)}}"""
+    user_ids = [uid for uid, doc in user_docs if (doc.get("preferences") or {}).get("liberal")]
+    docs = dict(user_docs)
+    user_inputs = [{"profile": docs[uid]["profile"], "preferences": {"liberal": docs[uid]["preferences"]["liberal"]}}
+                   for uid in user_ids]
+    user_matrix, complete = vectorize_user_inputs(user_inputs)
+    user_ids = [uid for uid, ok in zip(user_ids, complete) if ok]
+    user_inputs = [u for u, ok in zip(user_inputs, complete) if ok]
+    user_matrix = user_matrix[complete]
+    prev_lectures = [[{"과목명": name} for name in previous[uid]] for uid in user_ids]
+
+    results = {}
+    if not user_ids:
+        return results
+    batch_results = recommend_batch(user_inputs, user_matrix, prev_lectures, catalog)
+    for uid, user_input, vec, prev, (liberal, career) in zip(user_ids, user_inputs, user_matrix, prev_lectures, batch_results):
+        results[uid] = {
+            'liberal': (liberal, recommendation_key('liberal', user_input, vec, prev, catalog.version)),
+            'career': (career, recommendation_key('career', user_input, vec, prev, catalog.version))
+        }
+    return results
+
+
+def precompute_major(engine, user_docs, previous):
+    """전공 → {uid: {'major': (결과, 키)}} (전공 카탈로그가 없거나 선호 정보가 없으면 빠짐)"""
+    if engine is None:
+        return {}
+    user_ids = [uid for uid, doc in user_docs if (doc.get("preferences") or {}).get("major")]
+    docs = dict(user_docs)
+    user_inputs = [{"profile": docs[uid]["profile"], "preferences": {"major": docs[uid]["preferences"]["major"]}}
+                   for uid in user_ids]
+    prev_lectures = [[{"과목명": name} for name in previous[uid]] for uid in user_ids]
+    results = {}
+    for uid, (result, key) in zip(user_ids, engine.recommend_major_batch(user_inputs, prev_lectures)):
+        if result is not None:
+            results[uid] = {'major': (result, key)}
+    return results
+
+
+def precompute_chunk(user_docs, catalog, engine, dry_run=False):
+    previous = fetch_previous_courses_many([uid for uid, _ in user_docs])
+    parts = precompute_liberal(user_docs, previous, catalog)
+    for uid, major in precompute_major(engine, user_docs, previous).items():
+        parts.setdefault(uid, {}).update(major)
+
+    created_at = datetime.now().isoformat()
+    items = []
+    for uid, kinds in parts.items():
+        fields = {"createdAt": created_at, "stamps": {}}
+        for kind, field in PRECOMPUTED_FIELDS.items():
+            result, key = kinds.get(kind, (None, None))
+            fields[field] = result
+            if key is not None:
+                fields["stamps"][kind] = key
+        items.append((uid, fields))
+    if items and not dry_run:
+        save_precomputed_batch(items)
+    return len(items)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전체 사용자 추천 미리 계산")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="한 번에 계산/저장할 사용자 수")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    # 작업 도중 카탈로그가 바뀌어도 처음 받은 스냅샷으로 끝까지 계산 (버전이 stamps에 들어감)
+    catalog = get_catalog()
+    engine = load_major_engine()
+    started = time.perf_counter()
+    scanned = saved = 0
+    users = ((uid, doc) for uid, doc in stream_users() if complete_profile(doc))
+    while True:
+        chunk = list(itertools.islice(users, args.chunk))
+        if not chunk:
+            break
+        scanned += len(chunk)
+        saved += precompute_chunk(chunk, catalog, engine, args.dry_run)
+        print(f"[PRECOMPUTE] {scanned}명 처리, {saved}명 저장 ({time.perf_counter() - started:.1f}s)", flush=True)
+    print(f"✅ 미리 계산 완료: 프로필이 있는 사용자 {scanned}명 중 {saved}명, {time.perf_counter() - started:.1f}s")
+    return saved
+
+
+if __name__ == "__main__":
+    main()
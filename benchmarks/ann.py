@@ -0,0 +1,138 @@
+# 교양 카탈로그 근사 최근접 이웃(IVF) 벤치마크: nprobe별 recall@30과 지연시간을 정확 탐색과 비교
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.ann                                   # 10k/100k/1M, benchmarks/results/ann-{커밋}.json
+#   python -m benchmarks.ann --sizes 100000 --nprobe 4 8 16
+import argparse
+import ast
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from sklearn.preprocessing import normalize
+
+from benchmarks import synth
+from benchmarks.run import RESULTS_DIR, environment, git_commit, summarize
+from benchmarks.services import prepare_service, service_module, unload_services
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+DEFAULT_NPROBE = [1, 2, 4, 8, 16, 32, 64]
+K = 30
+
+
+def real_vectors():
+    df = synth._read(os.path.join(synth.LIBERAL_DATA, "강의_벡터화_일반교양.csv"))
+    return np.array([ast.literal_eval(v)[:20] for v in df['전체 벡터']], dtype=float)
+
+
+def synthetic_catalog(base, size, jitter, rng):
+    """실제 벡터를 복원 추출 + 작은 잡음 (잡음이 없으면 같은 벡터가 너무 많아 동점만 생김)"""
+    rows = base[rng.integers(0, len(base), size)]
+    if jitter:
+        rows = rows + rng.normal(0, jitter, rows.shape)
+    return normalize(rows).astype(np.float32)
+
+
+def top_k(rows, sim, k):
+    if len(rows) > k:
+        rows = rows[np.argpartition(-sim[rows], k - 1)[:k]]
+    return rows[np.argsort(-sim[rows], kind='stable')]
+
+
+def exact_search(matrix, query, k):
+    sim = matrix @ query
+    return top_k(np.arange(len(matrix)), sim, k), sim
+
+
+def ivf_search(index, matrix, query, k, nprobe):
+    rows = index.restrict(query, np.arange(len(matrix)), k, nprobe)
+    sim = np.empty(len(matrix))
+    sim[rows] = matrix[rows] @ query
+    return top_k(rows, sim, k)
+
+
+def bench_size(ann, features, size, args, rng):
+    matrix = synthetic_catalog(real_vectors(), size, args.jitter, rng)
+    users = synth.liberal_users(args.queries, {'liberal': [], 'career': []}, args.seed)
+    queries = normalize(features.vectorize_many([doc['preferences']['liberal'] for doc, _ in users])[0])
+
+    start = time.perf_counter()
+    index = ann.IVFIndex(matrix, n_lists=args.lists or None)
+    build_seconds = time.perf_counter() - start
+
+    exact, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        rows, sim = exact_search(matrix, q, K)
+        latencies.append(time.perf_counter() - start)
+        exact.append((set(rows.tolist()), sim[rows[-1]], sim))
+    results = [dict(mode="exact", size=size, nprobe=None, recall_at_30=1.0, score_recall_at_30=1.0,
+                    **summarize(latencies))]
+
+    for nprobe in args.nprobe:
+        latencies, recall, score_recall = [], [], []
+        for q, (truth, kth, sim) in zip(queries, exact):
+            start = time.perf_counter()
+            rows = ivf_search(index, matrix, q, K, nprobe)
+            latencies.append(time.perf_counter() - start)
+            recall.append(len(truth & set(rows.tolist())) / K)
+            # 동점(같은 점수) 행을 찾은 것도 맞힌 것으로 보는 recall
+            score_recall.append(min(K, int((sim[rows] >= kth - 1e-9).sum())) / K)
+        results.append(dict(mode="ivf", size=size, nprobe=nprobe,
+                            recall_at_30=round(float(np.mean(recall)), 4),
+                            score_recall_at_30=round(float(np.mean(score_recall)), 4),
+                            **summarize(latencies)))
+    for r in results:
+        r["index_build_s"] = round(build_seconds, 3)
+        if r["mode"] == "ivf":
+            stats = index.stats()
+            r.update(lists=stats["lists"], max_list_size=stats["max_list_size"])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IVF 인덱스 recall/지연시간 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=DEFAULT_NPROBE)
+    parser.add_argument("--lists", type=int, default=0, help="군집 수 (기본 √N)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--jitter", type=float, default=0.05, help="합성 벡터 잡음 표준편차")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+
+    prepare_service('liberal', synth.LIBERAL_DATA)
+    ann = service_module("ann")
+    features = service_module("feature_schema").LIBERAL_FEATURES
+    rng = np.random.default_rng(args.seed)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "environment": environment(),
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "results": []
+    }
+    try:
+        for size in args.sizes:
+            print(f"[BENCH] IVF {size:,}개 강의 ...", flush=True)
+            for r in bench_size(ann, features, size, args, rng):
+                report["results"].append(r)
+                label = "exact" if r["mode"] == "exact" else f"nprobe={r['nprobe']}"
+                print(f"  {label:<12} recall@30 {r['recall_at_30']:.3f} (동점 포함 {r['score_recall_at_30']:.3f})  "
+                      f"p50 {r['p50_ms']:>8.3f}ms  p99 {r['p99_ms']:>8.3f}ms", flush=True)
+    finally:
+        unload_services()
+
+    out = args.out or os.path.join(RESULTS_DIR, f"ann-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과 저장: {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
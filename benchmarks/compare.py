@@ -0,0 +1,57 @@
+# 벤치마크 결과 JSON 두 개 비교 (이전 커밋 → 이후 커밋)
+# 사용법: python -m benchmarks.compare 이전.json 이후.json [--threshold 0.1]
+# p50/p99가 threshold 비율 이상 느려진 항목이 있으면 종료 코드 1
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p99_ms")
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    return report, {(r["service"], r["target"], r["size"]): r for r in report["results"]}
+
+
+def change(before, after):
+    if not before or after is None:
+        return None
+    return (after - before) / before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.1, help="느려짐으로 볼 비율 (기본 10%%)")
+    args = parser.parse_args(argv)
+
+    before_report, before = load(args.before)
+    after_report, after = load(args.after)
+    print(f"{before_report['commit']} → {after_report['commit']}")
+
+    regressions = 0
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[0], k[2], k[1])):
+        if not all(m in before[key] for m in METRICS):
+            continue
+        service, target, size = key
+        cells = []
+        slower = False
+        for metric in METRICS:
+            ratio = change(before[key][metric], after[key][metric])
+            cells.append(f"{metric} {before[key][metric]:>9.3f} → {after[key][metric]:>9.3f} "
+                         f"({'n/a' if ratio is None else f'{ratio:+.0%}'})")
+            slower |= ratio is not None and ratio > args.threshold
+        regressions += slower
+        flag = "⚠️ " if slower else "  "
+        print(f"{flag}{service:<8} {size:>8,} {target:<40} " + "  ".join(cells))
+
+    for key in sorted(before.keys() ^ after.keys()):
+        print(f"  (한쪽에만 있음) {key}")
+    print(f"느려진 항목 {regressions}개 (기준 {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+# 추천 엔진 벤치마크: 합성 카탈로그(1k ~ 1M 강의)에서 함수/엔드포인트별 지연시간, 메모리, 처리량 측정
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.run                                  # 전체 크기, benchmarks/results/{커밋}.json 저장
+#   python -m benchmarks.run --sizes 1000 10000 --users 100   # 일부 크기만
+#   python -m benchmarks.run --storage sqlite                 # 엔드포인트 저장소를 SQLite로 (기본 memory)
+#   python -m benchmarks.compare 이전.json 이후.json           # 커밋 간 비교
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks import synth
+from benchmarks.services import ROOT, prepare_service, service_module, unload_services
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+# ===== 측정 도구 =====
+def summarize(latencies, items_per_call=1):
+    latencies = np.asarray(latencies, dtype=float)
+    total = float(latencies.sum())
+    return {
+        "calls": int(len(latencies)),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+        "mean_ms": round(float(latencies.mean()) * 1000, 3),
+        "throughput_per_s": round(len(latencies) * items_per_call / total, 2) if total else None
+    }
+
+
+def peak_memory_mb(fn, calls):
+    """calls 안의 호출을 실행하는 동안 새로 잡힌 메모리 최대치 (tracemalloc, MB)"""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for args in calls:
+            fn(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round((peak - base) / 2 ** 20, 3)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run_target(fn, calls, args, items_per_call=1):
+    """calls 목록을 순서대로 실행. 예산(초)을 넘으면 최소 호출 수 이후 중단"""
+    for call in calls[:args.warmup]:
+        fn(*call)
+    latencies = []
+    started = time.perf_counter()
+    for call in calls:
+        latencies.append(timed(fn, *call)[1])
+        if len(latencies) >= args.min_calls and time.perf_counter() - started > args.budget:
+            break
+    result = summarize(latencies, items_per_call)
+    result["peak_mem_mb"] = peak_memory_mb(fn, calls[:args.mem_calls])
+    return result
+
+
+# ===== 서비스별 시나리오 =====
+def seed_storage(client, users):
+    """서비스 저장소(STORAGE_BACKEND=memory/sqlite)에 합성 사용자 문서 + 이전 수강 강의 저장"""
+    for i, (doc, previous) in enumerate(users):
+        uid = f"bench-{i}"
+        client.collection("users").document(uid).set(doc)
+        for j, title in enumerate(previous):
+            client.collection("users").document(uid).collection("previous_courses") \
+                .document(str(j)).set({"과목명": title, "교수명": None})
+    return [f"bench-{i}" for i in range(len(users))]
+
+
+def load_timings(catalog, load, data_dir):
+    """CSV 로드 → 번들 빌드 → 번들 로드 시간 (초)"""
+    _, csv_seconds = timed(load, data_dir)
+    _, build_seconds = timed(catalog.build_bundle, data_dir)
+    _, bundle_seconds = timed(load, data_dir)
+    return {
+        "load_csv_s": round(csv_seconds, 3),
+        "build_bundle_s": round(build_seconds, 3),
+        "load_bundle_s": round(bundle_seconds, 3)
+    }
+
+
+def bench_major(size, data_dir, args):
+    titles = synth.write_major_catalog(data_dir, size, args.seed)
+    users = synth.major_users(args.users, titles, args.seed)
+    prepare_service('major', data_dir, {"RECOMMEND_CACHE_SIZE": args.cache_size}, args.storage)
+    catalog = service_module("major.catalog")
+    loads = load_timings(catalog, catalog.load_catalogs, data_dir)
+
+    main = service_module("main")
+    recommend = service_module("major.recommend")
+    previous = [[{"과목명": t} for t in prev] for _, prev in users]
+    results = {}
+    docs = [doc for doc, _ in users]
+    results["vectorize_user_inputs"] = run_target(
+        recommend.vectorize_user_inputs, [(docs,)] * args.min_calls, args, len(docs))
+    results["recommend_major_lectures"] = run_target(
+        recommend.recommend_major_lectures, [(doc, prev) for (doc, _), prev in zip(users, previous)], args)
+    chunks = [([d for d, _ in users[i:i + args.batch_size]], previous[i:i + args.batch_size])
+              for i in range(0, len(users), args.batch_size)]
+    results["recommend_major_lectures_batch"] = run_target(
+        recommend.recommend_major_lectures_batch, chunks, args, args.batch_size)
+    results.update(bench_endpoints(main.app, users, [
+        ("POST /recommend/", "/recommend/", lambda uid: {"user_id": uid})
+    ], args))
+    return loads, results
+
+
+def bench_liberal(size, data_dir, args):
+    titles = synth.write_liberal_catalog(data_dir, size, args.seed)
+    users = synth.liberal_users(args.users, titles, args.seed)
+    prepare_service('liberal', data_dir, {"RECOMMEND_CACHE_SIZE": args.cache_size}, args.storage)
+    catalog = service_module("catalog")
+    loads = load_timings(catalog, catalog.load_catalog, data_dir)
+
+    main = service_module("main")
+    recommender = service_module("recommender")
+    inputs = [{"profile": doc["profile"], "preferences": doc["preferences"]} for doc, _ in users]
+    vectors = [recommender.vectorize_user_input(u) for u in inputs]
+    previous = [[{"과목명": t} for t in prev] for _, prev in users]
+    results = {}
+    results["vectorize_user_inputs"] = run_target(
+        recommender.vectorize_user_inputs, [(inputs,)] * args.min_calls, args, len(inputs))
+    results["recommend_liberal"] = run_target(
+        recommender.recommend_liberal,
+        [(v, p, set(), u["profile"]["학년"]) for u, v, p in zip(inputs, vectors, previous)], args)
+    results["recommend_combined"] = run_target(
+        recommender.recommend_combined, list(zip(inputs, vectors, previous)), args)
+    results["recommend_career"] = run_target(
+        recommender.recommend_career, list(zip(inputs, vectors, previous)), args)
+    chunks = [(inputs[i:i + args.batch_size], np.vstack(vectors[i:i + args.batch_size]), previous[i:i + args.batch_size])
+              for i in range(0, len(users), args.batch_size)]
+    results["recommend_batch"] = run_target(recommender.recommend_batch, chunks, args, args.batch_size)
+    results.update(bench_endpoints(main.app, users, [
+        ("POST /recommend/liberal-career", "/recommend/liberal-career",
+         lambda uid: {"user_id": uid, "doc_id": "bench"})
+    ], args))
+    return loads, results
+
+
+def bench_endpoints(app, users, endpoints, args):
+    from fastapi.testclient import TestClient
+
+    user_ids = seed_storage(service_module("firebase_utils").db, users)
+    results = {}
+    with TestClient(app) as client:
+        for name, path, body in endpoints:
+            def call(uid):
+                response = client.post(path, json=body(uid))
+                response.raise_for_status()
+            results[name] = run_target(call, [(uid,) for uid in user_ids], args)
+    return results
+
+
+SCENARIOS = {'major': bench_major, 'liberal': bench_liberal}
+
+
+# ===== 실행 환경 정보 =====
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=ROOT).returncode != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def max_rss_mb():
+    # 리눅스는 KB, macOS는 바이트 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추천 엔진 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="카탈로그 강의 수")
+    parser.add_argument("--services", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=200, help="합성 사용자 수 (= 대상별 최대 호출 수)")
+    parser.add_argument("--batch-size", type=int, default=50, help="일괄 추천 함수 한 번에 넣을 사용자 수")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--min-calls", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=20.0, help="대상별 측정 시간 상한(초)")
+    parser.add_argument("--mem-calls", type=int, default=5, help="메모리 측정에 쓸 호출 수")
+    parser.add_argument("--cache-size", type=int, default=0, help="추천 결과 캐시 크기 (기본 0 = 캐시 없이 측정)")
+    parser.add_argument("--storage", choices=["memory", "sqlite"], default="memory",
+                        help="엔드포인트가 Firestore 대신 쓸 로컬 저장소")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 경로 (기본 benchmarks/results/{커밋}.json)")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "environment": environment(),
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "results": []
+    }
+    for size in args.sizes:
+        for service in args.services:
+            data_dir = tempfile.mkdtemp(prefix=f"bench-{service}-{size}-")
+            print(f"[BENCH] {service} {size:,}개 강의 ...", flush=True)
+            try:
+                # 서비스의 [BOOT]/[DEBUG] 출력은 측정 결과와 섞이지 않게 숨김
+                with contextlib.redirect_stdout(io.StringIO()):
+                    loads, targets = SCENARIOS[service](size, data_dir, args)
+            finally:
+                unload_services()
+                shutil.rmtree(data_dir, ignore_errors=True)
+            for target, stats in targets.items():
+                report["results"].append(dict(service=service, target=target, size=size, **stats))
+                print(f"  {target:<40} p50 {stats['p50_ms']:>9.3f}ms  p99 {stats['p99_ms']:>9.3f}ms  "
+                      f"{stats['throughput_per_s']:>9}/s  peak {stats['peak_mem_mb']}MB", flush=True)
+            report["results"].append(dict(service=service, target="catalog_load", size=size, **loads))
+            print(f"  {'catalog_load':<40} {loads}", flush=True)
+    report["max_rss_mb"] = max_rss_mb()
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과 저장: {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
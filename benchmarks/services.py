@@ -0,0 +1,54 @@
+import importlib
+import os
+import sys
+
+# ===== 서비스 모듈 격리 로드 =====
+# Recommendation1/2는 각자 폴더에서 배포되어 main, firebase_utils 같은 모듈 이름이 겹친다.
+# 한 프로세스에서 번갈아 불러오려면 이전 서비스 모듈을 sys.modules에서 지우고 sys.path를 바꿔야 한다.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICE_DIRS = {
+    'major': os.path.join(ROOT, "Recommendation1"),
+    'liberal': os.path.join(ROOT, "Recommendation2")
+}
+
+
+def _service_module_names(service_dir):
+    names = set()
+    for entry in os.listdir(service_dir):
+        path = os.path.join(service_dir, entry)
+        if entry.endswith(".py"):
+            names.add(entry[:-3])
+        elif os.path.isdir(path) and os.path.exists(os.path.join(path, "__init__.py")):
+            names.add(entry)
+    return names
+
+
+def unload_services():
+    # 공용 패키지(common)도 환경 변수(STORAGE_BACKEND 등)를 import 때 읽으므로 같이 내림
+    names = {"common"}
+    for service_dir in SERVICE_DIRS.values():
+        names |= _service_module_names(service_dir)
+        while service_dir in sys.path:
+            sys.path.remove(service_dir)
+    for name in list(sys.modules):
+        if name.split('.')[0] in names:
+            del sys.modules[name]
+
+
+def prepare_service(service, data_dir, env=None, storage="memory"):
+    """service: 'major' | 'liberal'. 이후 import하는 서비스 모듈은 data_dir의 카탈로그를 사용.
+    storage: 'memory' | 'sqlite' — Firestore 대신 쓸 로컬 저장소 (sqlite 파일은 data_dir 안에)"""
+    unload_services()
+    os.environ["STORAGE_BACKEND"] = storage
+    os.environ["STORAGE_SQLITE_PATH"] = os.path.join(data_dir, "storage.sqlite3")
+    os.environ["CATALOG_DATA_DIR"] = data_dir
+    os.environ["MAJOR_CATALOG_DATA_DIR"] = data_dir
+    os.environ["CATALOG_WATCH_INTERVAL"] = "0"
+    os.environ["MAJOR_SERVICE_DIR"] = ""        # 교양 서비스의 통합 추천용 전공 엔진은 측정 대상 아님
+    for key, value in (env or {}).items():
+        os.environ[key] = str(value)
+    sys.path.insert(0, SERVICE_DIRS[service])
+
+
+def service_module(name):
+    return importlib.import_module(name)
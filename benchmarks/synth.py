@@ -0,0 +1,127 @@
+import glob
+import os
+import random
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# ===== 합성 카탈로그 / 사용자 생성 =====
+# 실제 CSV 행을 복원 추출해서 스키마와 값 분포(벡터, 영역, 이수구분 ...)는 그대로 두고 행 수만 늘린다.
+# 과목명에는 복제 회차 번호를 붙여서, 원본 안의 (과목명, 교수명) 중복 비율도 유지한다.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAJOR_DATA = os.path.join(ROOT, "Recommendation1", "data")
+LIBERAL_DATA = os.path.join(ROOT, "Recommendation2", "data")
+
+# 벤치마크용 전공 (Recommendation1 카탈로그 파일명 → 프로필)
+BENCH_COLLEGE = "벤치마크대학"
+BENCH_MAJOR = "벤치마크학과"
+
+MAJOR_OPTIONS = {
+    '수업유형': ['블렌디드', '원격', '일반'],
+    '출결': ['전자출결', '직접호명', '모름', '복합적', '반영안함'],
+    '시험': ['없음', '한 번', '두 번', '세 번', '네 번 이상'],
+    '과제': ['많음', '보통', '없음'],
+    '조모임': ['많음', '보통', '없음'],
+    '성적': ['너그러움', '보통', '모름', '깐깐함'],
+    '강의시간': ['풀강', '풀강 아님'],
+    '강의력': ['좋음', '보통', '나쁨'],
+    '평점': ['4.5', '3.2', '2', '1']
+}
+LIBERAL_OPTIONS = dict(MAJOR_OPTIONS, 캠퍼스=['수정', '운정', '상관없음'])
+
+
+def _read(path):
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    # 끝에 쉼표가 잔뜩 붙은 원본 파일이 있어서 이름 없는 빈 컬럼은 버림
+    return df.loc[:, ~df.columns.astype(str).str.startswith('Unnamed:')]
+
+
+def _resample(df, size, rng):
+    rows = df.iloc[rng.integers(0, len(df), size)].reset_index(drop=True)
+    copy_no = (np.arange(size) // len(df)).astype(str)
+    rows['과목명'] = rows['과목명'].astype(str) + ' ' + copy_no
+    return rows
+
+
+def _write(df, path):
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+# ===== Recommendation1: 전공 카탈로그 1개 (size행) =====
+def write_major_catalog(data_dir, size, seed=0):
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    sources = [p for p in glob.glob(os.path.join(MAJOR_DATA, "강의_벡터화_*.csv"))]
+    frames = []
+    for path in sorted(sources):
+        df = _read(path)
+        # 벡터 문자열이 깨진 행은 원본 로더가 버리므로 미리 제외
+        frames.append(df[df['전체벡터'].astype(str).str.startswith('[')])
+    rows = _resample(pd.concat(frames, ignore_index=True), size, rng)
+    rows['개설학과전공'] = BENCH_MAJOR
+    _write(rows, os.path.join(data_dir, f"강의_벡터화_{BENCH_COLLEGE}_{BENCH_MAJOR}.csv"))
+    return rows['과목명'].tolist()
+
+
+# ===== Recommendation2: 교양/진로소양 각 size행 + 필수추천 원본 복사 =====
+def write_liberal_catalog(data_dir, size, seed=0):
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    titles = {}
+    for kind, filename in (('liberal', "강의_벡터화_일반교양.csv"), ('career', "강의_벡터화_진로소양.csv")):
+        rows = _resample(_read(os.path.join(LIBERAL_DATA, filename)), size, rng)
+        _write(rows, os.path.join(data_dir, filename))
+        titles[kind] = rows['과목명'].tolist()
+    for path in glob.glob(os.path.join(LIBERAL_DATA, "필수추천_*.csv")):
+        shutil.copy(path, data_dir)
+    return titles
+
+
+def liberal_majors():
+    """필수추천 분기(그룹 1/2/3, 전공별 파일, 없음)를 골고루 타도록 실제 전공명 목록"""
+    majors = set()
+    for path in glob.glob(os.path.join(LIBERAL_DATA, "필수추천_*.csv")):
+        df = _read(path)
+        if '전공명' in df.columns:
+            majors.update(df['전공명'].dropna().unique())
+        else:
+            majors.add(os.path.splitext(os.path.basename(path))[0][len("필수추천_"):])
+    return sorted(majors) + ["기타학과"]
+
+
+# ===== 합성 사용자 =====
+def _preferences(options, rand):
+    return {field: rand.choice(values) for field, values in options.items()}
+
+
+def _previous(titles, rand, max_count=5):
+    return rand.sample(titles, min(len(titles), rand.randint(0, max_count)))
+
+
+def major_users(count, titles, seed=0):
+    """[(user_doc, 이전 수강 과목명 목록)] — Recommendation1 Firestore 문서 형태"""
+    rand = random.Random(seed)
+    users = []
+    for _ in range(count):
+        doc = {
+            'profile': {'단과대학': BENCH_COLLEGE, '전공': BENCH_MAJOR, '학년': rand.randint(1, 4)},
+            'preferences': {'major': _preferences(MAJOR_OPTIONS, rand)}
+        }
+        users.append((doc, _previous(titles, rand)))
+    return users
+
+
+def liberal_users(count, titles, seed=0):
+    """[(user_doc, 이전 수강 과목명 목록)] — Recommendation2 Firestore 문서 형태"""
+    rand = random.Random(seed)
+    majors = liberal_majors()
+    users = []
+    for _ in range(count):
+        doc = {
+            'profile': {'단과대학': rand.choice(['공과대학', '사범대학', '인문대학']),
+                        '전공': rand.choice(majors), '학년': rand.randint(1, 4)},
+            'preferences': {'liberal': _preferences(LIBERAL_OPTIONS, rand)}
+        }
+        users.append((doc, _previous(titles['liberal'] + titles['career'], rand)))
+    return users
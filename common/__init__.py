@@ -0,0 +1,10 @@
+# ===== 서비스 공용 패키지 =====
+# 여러 서비스에 똑같이 복사해 두던 모듈을 한 곳에 모아 둔다.
+#  - metrics: 단계별 소요 시간 히스토그램, /metrics, 디버그 로그 샘플링
+#  - storage: STORAGE_BACKEND(firestore/memory/sqlite)에 맞는 Firestore 모양 클라이언트
+#  - write_behind: 문서 쓰기를 모아 배치로 보내는 큐
+#  - bundle, catalog_manager: 강의 카탈로그 바이너리 번들, 변경 감시/무중단 교체
+#  - features: 선호 정보 → 벡터 스키마 (필드 선언, 룩업 테이블, 추천 이유)
+#  - cache: 추천 결과 LRU + TTL 캐시(RecommendationCache), 캐시 키, 미리 계산된 추천 조회
+# 각 서비스의 requirements.txt에 ../common으로 설치되어 있어서 from common.metrics import timed 처럼 불러온다.
+# 외부 라이브러리(prometheus-client 등)는 이 패키지가 아니라 쓰는 서비스의 requirements.txt에 둔다.
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+from sklearn.preprocessing import normalize
+
+# ===== 바이너리 카탈로그 번들 =====
+# data/bundle/
+#   vectors-{버전}.npy     모든 테이블의 강의 벡터를 이어 붙인 float32 블록
+#   normalized-{버전}.npy  코사인 유사도용으로 미리 정규화한 같은 블록
+#   meta.json             테이블별 offset/rows + 컬럼별 메타데이터 + 원본 CSV 정보 + 벡터 파일 이름
+# 벡터 블록은 np.load(mmap_mode='r')로 읽어서 여러 uvicorn 워커가 같은 페이지를 공유한다.
+# 서비스 중 번들을 다시 빌드해도 기존 파일을 덮어쓰지 않고 새 파일을 만든 뒤 meta.json만 교체하므로,
+# 이전 스냅샷이 mmap으로 보고 있는 파일은 잘리지 않는다.
+BUNDLE_DIR_NAME = "bundle"
+VECTORS_FILE = "vectors.npy"
+NORMALIZED_FILE = "normalized.npy"
+META_FILE = "meta.json"
+
+
+def source_stats(paths):
+    """원본 CSV의 (크기, 수정시각) — 번들이 최신인지 확인하는 기준"""
+    stats = {}
+    for path in paths:
+        st = os.stat(path)
+        stats[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+def sources_version(stats):
+    digest = hashlib.sha1(json.dumps(stats, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def content_version(paths):
+    """원본 CSV 내용 해시 — 카탈로그 버전. 수정시각과 무관해서 다른 서버/배포에서도 같은 데이터면 같은 값
+    (미리 계산된 추천의 stamps를 여러 프로세스가 비교할 수 있다)"""
+    digest = hashlib.sha1()
+    for path in sorted(paths, key=os.path.basename):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def catalog_fingerprint(bundle_dir, source_paths):
+    """핫 리로드 감지용 지문: 원본 CSV (크기, 수정시각) + 번들 meta.json 수정시각"""
+    stats = source_stats(source_paths)
+    meta_path = os.path.join(bundle_dir, META_FILE)
+    if os.path.exists(meta_path):
+        stats[f"{BUNDLE_DIR_NAME}/{META_FILE}"] = os.stat(meta_path).st_mtime_ns
+    return sources_version(stats)
+
+
+def _versioned(filename, version):
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}-{version}{ext}"
+
+
+def _save_array(bundle_dir, filename, array):
+    # 임시 파일에 쓰고 교체 → 같은 이름 파일을 mmap 중인 프로세스가 있어도 안전
+    tmp_path = os.path.join(bundle_dir, filename + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, os.path.join(bundle_dir, filename))
+
+
+def _to_json_value(value):
+    # NaN(빈 칸)은 None으로 저장
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+# ===== 번들 쓰기 =====
+def write_bundle(bundle_dir, tables, source_paths, dim):
+    """tables: [{'name', 'key', 'matrix'(없으면 None), 'columns': {컬럼명: 값 목록}}]"""
+    os.makedirs(bundle_dir, exist_ok=True)
+    blocks = []
+    offset = 0
+    entries = []
+    for table in tables:
+        matrix = table.get('matrix')
+        rows = 0 if matrix is None else len(matrix)
+        if rows:
+            blocks.append(np.asarray(matrix, dtype=np.float64).reshape(rows, dim))
+        entries.append({
+            'name': table['name'],
+            'key': list(table['key']) if table.get('key') is not None else None,
+            'offset': offset,
+            'rows': rows,
+            'columns': {col: [_to_json_value(v) for v in values] for col, values in table['columns'].items()}
+        })
+        offset += rows
+
+    vectors = np.concatenate(blocks) if blocks else np.zeros((0, dim))
+    stats = source_stats(source_paths)
+    version = content_version(source_paths)
+    files = {
+        'vectors': _versioned(VECTORS_FILE, version),
+        'normalized': _versioned(NORMALIZED_FILE, version)
+    }
+    _save_array(bundle_dir, files['vectors'], vectors.astype(np.float32))
+    _save_array(bundle_dir, files['normalized'], normalize(vectors).astype(np.float32))
+    meta = {
+        'version': version,
+        'dim': dim,
+        'sources': stats,
+        'files': files,
+        'tables': entries
+    }
+    # meta.json을 마지막에 써서, 쓰다 만 번들은 읽히지 않게 한다
+    tmp_path = os.path.join(bundle_dir, META_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(bundle_dir, META_FILE))
+
+    # 이전 버전 벡터 파일 정리 (mmap 중인 프로세스는 삭제 후에도 기존 내용을 계속 읽음)
+    for filename in os.listdir(bundle_dir):
+        if filename.endswith(".npy") and filename not in files.values():
+            os.remove(os.path.join(bundle_dir, filename))
+    return meta
+
+
+# ===== 번들 읽기 =====
+def read_bundle(bundle_dir, source_paths):
+    """번들이 없거나 원본 CSV보다 오래되었으면 None"""
+    meta_path = os.path.join(bundle_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('sources') != source_stats(source_paths):
+        print(f"[WARN] {bundle_dir} 번들이 원본 CSV와 다릅니다. CSV에서 직접 로드합니다.")
+        return None
+    files = meta.get('files', {'vectors': VECTORS_FILE, 'normalized': NORMALIZED_FILE})
+    vectors = np.load(os.path.join(bundle_dir, files['vectors']), mmap_mode='r')
+    normalized = np.load(os.path.join(bundle_dir, files['normalized']), mmap_mode='r')
+    return meta, vectors, normalized
+
+
+def table_arrays(table, vectors, normalized):
+    """테이블 하나의 (벡터, 정규화 벡터, 컬럼별 배열) — 벡터는 mmap 뷰(복사 없음)"""
+    start, stop = table['offset'], table['offset'] + table['rows']
+    columns = {}
+    for col, values in table['columns'].items():
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        columns[col] = array
+    return vectors[start:stop], normalized[start:stop], columns
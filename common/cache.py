@@ -0,0 +1,102 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# ===== 추천 결과 캐시 설정 =====
+CACHE_MAX_SIZE = int(os.getenv("RECOMMEND_CACHE_SIZE", "4096"))
+CACHE_TTL_SECONDS = float(os.getenv("RECOMMEND_CACHE_TTL", "600"))
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        # float32 오차로 키가 달라지지 않게 반올림
+        return np.round(value.astype(float), 6).tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def make_key(*parts):
+    """(카탈로그 버전, 프로필, 사용자 벡터, 이전 수강 과목 ...) → 해시 키"""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+# ===== 미리 계산된 추천 (Recommendation2/precompute.py → users/{uid}/precomputed/latest) =====
+# stamps에는 결과를 계산할 때의 캐시 키(카탈로그 버전 + 프로필 + 선호 벡터 + 이전 수강 과목)가 들어 있어서,
+# 지금 요청의 키와 같을 때만 저장된 결과를 그대로 쓰고 다르면 다시 계산한다.
+# results 컬렉션에 두면 앱이 문서 id 내림차순 첫 문서를 최신 결과로 보기 때문에 따로 둔다.
+PRECOMPUTED_COLLECTION = "precomputed"
+PRECOMPUTED_DOC_ID = "latest"
+PRECOMPUTED_FIELDS = {
+    'major': "majorRecommendations",
+    'liberal': "liberalRecommendations",
+    'career': "careerRecommendations"
+}
+
+
+def precomputed_result(precomputed, kind, key):
+    """precomputed 문서에서 kind 추천 결과. 키가 다르거나 없으면 None"""
+    if not precomputed or (precomputed.get("stamps") or {}).get(kind) != key:
+        return None
+    return precomputed.get(PRECOMPUTED_FIELDS[kind])
+
+
+class RecommendationCache:
+    """LRU + TTL 캐시. 같은 선호/전공/학년/수강 이력이면 점수 계산 없이 결과 반환"""
+
+    def __init__(self, max_size=CACHE_MAX_SIZE, ttl=CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()    # key → (만료 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            value = item[1]
+        # 호출 측에서 결과를 수정해도 캐시가 바뀌지 않게 복사본 반환
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
@@ -0,0 +1,132 @@
+import os
+import threading
+from datetime import datetime, timezone
+
+# ===== 카탈로그 핫 리로드 설정 =====
+# 0이면 감시 스레드를 띄우지 않음 (수동 reload만)
+WATCH_INTERVAL_SECONDS = float(os.getenv("CATALOG_WATCH_INTERVAL", "30"))
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class CatalogManager:
+    """카탈로그 스냅샷 관리자.
+    - 원본 파일 지문(크기/수정시각, 번들 meta.json)이 바뀌면 백그라운드에서 새 카탈로그를 만들고 통째로 교체
+    - 요청은 current()로 받은 스냅샷 하나만 끝까지 사용 → 교체 중에도 이전 스냅샷으로 안전하게 처리
+    - 쓰는 중인 파일을 읽지 않도록, 지문이 두 번 연속 같을 때(안정된 뒤)만 로드"""
+
+    def __init__(self, name, loader, fingerprint, interval=WATCH_INTERVAL_SECONDS):
+        self.name = name
+        self._loader = loader              # () → 카탈로그 스냅샷 (.version 필요)
+        self._fingerprint = fingerprint    # () → 원본 파일 지문 문자열
+        self.interval = interval
+        self._snapshot = None
+        self._loaded_fingerprint = None
+        self._pending_fingerprint = None
+        self._listeners = []
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.loaded_at = None
+        self.last_checked = None
+        self.last_error = None
+        self.reloads = 0
+
+    # ===== 스냅샷 =====
+    def current(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.reload(notify=False)
+        return snapshot
+
+    def on_reload(self, callback):
+        """새 스냅샷으로 교체된 뒤 호출할 함수 등록 (예: 추천 결과 캐시 비우기)"""
+        self._listeners.append(callback)
+        return callback
+
+    def reload(self, notify=True):
+        with self._load_lock:
+            # 로드 전후 지문이 다르면 로드 도중 파일이 바뀐 것 → 다음 확인 때 다시 로드
+            before = self._safe_fingerprint()
+            snapshot = self._loader()
+            after = self._safe_fingerprint()
+            old = self._snapshot
+            self._snapshot = snapshot          # 참조 교체는 원자적 — 진행 중인 요청은 이전 스냅샷 유지
+            self._loaded_fingerprint = before if before == after else None
+            self._pending_fingerprint = None
+            self.loaded_at = _now_iso()
+            self.last_error = None
+            if old is not None:
+                self.reloads += 1
+        if notify and old is not None:
+            for callback in self._listeners:
+                callback(snapshot)
+        return snapshot
+
+    # ===== 변경 감지 =====
+    def _safe_fingerprint(self):
+        try:
+            return self._fingerprint()
+        except OSError:
+            # 파일 교체 중(삭제 후 생성 등)이면 이번 확인은 건너뜀
+            return None
+
+    def check(self):
+        """지문이 바뀌었고 직전 확인과 같으면(안정) 리로드. 리로드했으면 True"""
+        self.last_checked = _now_iso()
+        fingerprint = self._safe_fingerprint()
+        if fingerprint is None or fingerprint == self._loaded_fingerprint:
+            self._pending_fingerprint = None
+            return False
+        if fingerprint != self._pending_fingerprint:
+            self._pending_fingerprint = fingerprint
+            return False
+        try:
+            snapshot = self.reload()
+        except Exception as e:
+            # 새 파일이 깨져 있으면 기존 스냅샷으로 계속 서비스
+            self.last_error = f"{type(e).__name__}: {e}"
+            self._pending_fingerprint = None
+            self._loaded_fingerprint = fingerprint
+            print(f"[WARN] {self.name} 카탈로그 리로드 실패, 기존 버전 유지: {self.last_error}")
+            return False
+        print(f"[RELOAD] {self.name} 카탈로그 교체 완료 (버전 {snapshot.version})")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"[WARN] {self.name} 카탈로그 확인 실패: {self.last_error}")
+
+    def start(self):
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self.current()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name=f"{self.name}-catalog-watcher", daemon=True)
+        self._thread.start()
+        print(f"[BOOT] {self.name} 카탈로그 변경 감시 시작 ({self.interval:g}초 간격)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def status(self):
+        snapshot = self._snapshot
+        return {
+            "name": self.name,
+            "version": snapshot.version if snapshot is not None else None,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "watching": self._thread is not None and self._thread.is_alive(),
+            "watch_interval_seconds": self.interval,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,232 @@
+import operator
+
+import numpy as np
+import pandas as pd
+
+# ===== 선호도 설문 → 벡터 스키마 =====
+# 필드(수업유형, 출결, 시험 ...)마다
+#   - 사용자 설문 값 → 벡터 구간(encode)
+#   - 강의 벡터 값 → 추천 이유 라벨(Decode)
+# 을 선언해 두고, 인코더와 추천 이유 해석기가 같은 스키마를 사용한다.
+# 설문 값 → 벡터 구간은 값마다 한 번만 계산해서 룩업 테이블에 저장하므로,
+# 여러 사용자를 벡터화할 때는 열마다 고유값만 계산하고 나머지는 배열 인덱싱으로 채운다.
+
+_OPS = {'==': operator.eq, '>': operator.gt, '<=': operator.le}
+TABLE_LIMIT = 1024  # 필드별 룩업 테이블 최대 크기 (자유 입력 값이 계속 쌓이지 않게)
+
+
+class Decode:
+    """강의 벡터 값 → 추천 이유 라벨. rules: [(비교, 기준값, 라벨)] 순서대로 검사, 해당 없으면 default"""
+
+    def __init__(self, rules, default=None, divide=1.0):
+        self.rules = [(_OPS[op], threshold, label) for op, threshold, label in rules]
+        self.default = default
+        self.divide = divide
+
+    def label(self, value):
+        value = value / self.divide
+        for op, threshold, label in self.rules:
+            if op(value, threshold):
+                return label
+        return self.default
+
+
+class Field:
+    """설문 필드 하나 → 벡터 width칸. 하위 클래스는 encode(value) → width개 값 목록을 정의"""
+    width = 1
+
+    def __init__(self, name, decode=None):
+        self.name = name
+        self.decode = decode                    # 강의 벡터 값 → 추천 이유 (Decode 또는 None)
+        self._table = {}
+
+    def known_values(self):
+        return []
+
+    def decoders(self):
+        return [self.decode] * self.width
+
+    def lookup(self, value):
+        """룩업 테이블에서 벡터 구간 조회 (처음 보는 값이면 계산해서 저장)"""
+        try:
+            return self._table[value]
+        except KeyError:
+            encoded = tuple(self.encode(value))
+            if len(self._table) < TABLE_LIMIT:
+                self._table[value] = encoded
+            return encoded
+        except TypeError:
+            # 해시할 수 없는 값(리스트 등)은 저장하지 않고 계산만
+            return tuple(self.encode(value))
+
+    def compile(self):
+        for value in self.known_values():
+            self.lookup(value)
+        return self
+
+
+class OneHot(Field):
+    """categories 중 일치하는 칸만 weight. 강의 쪽은 reason 조건을 만족하면 라벨(기본은 카테고리 이름)이 이유"""
+
+    def __init__(self, name, categories, weight=1.0, reason=('==', 1), reason_divide=1.0, labels=None):
+        super().__init__(name)
+        self.categories = list(categories)
+        self.labels = list(labels) if labels is not None else self.categories
+        self.width = len(self.categories)
+        self.weight = weight
+        self.reason = reason
+        self.reason_divide = reason_divide
+
+    def encode(self, value):
+        return [self.weight * (1 if value == c else 0) for c in self.categories]
+
+    def known_values(self):
+        return self.categories
+
+    def decoders(self):
+        op, threshold = self.reason
+        return [Decode([(op, threshold, label)], divide=self.reason_divide) for label in self.labels]
+
+
+class Keyword(Field):
+    """설문 문장에 들어 있는 글자로 값 결정 (예: '두 번' → 0.6). rules: [(글자 목록, 값)] 순서대로"""
+
+    def __init__(self, name, rules, default, divide=1.0, decode=None):
+        super().__init__(name, decode)
+        self.rules = rules
+        self.default = default
+        self.divide = divide
+
+    def encode(self, value):
+        text = str(value)
+        for keywords, result in self.rules:
+            if any(k in text for k in keywords):
+                return [result / self.divide]
+        return [self.default / self.divide]
+
+
+class Mapping(Field):
+    """설문 값 그대로 대응표에서 찾기 (없으면 default)"""
+
+    def __init__(self, name, mapping, default, decode=None):
+        super().__init__(name, decode)
+        self.mapping = mapping
+        self.default = default
+
+    def encode(self, value):
+        return [self.mapping.get(value, self.default)]
+
+    def known_values(self):
+        return list(self.mapping)
+
+
+class Bucket(Field):
+    """숫자 구간 → 값. bins: [(하한, 상한, 닫힌 쪽 'left'|'right'|'both', 값)] 순서대로,
+    숫자가 아니면 invalid, 어느 구간에도 없으면 default"""
+
+    def __init__(self, name, bins, default, invalid=0.0, divide=1.0, decode=None):
+        super().__init__(name, decode)
+        self.bins = bins
+        self.default = default
+        self.invalid = invalid
+        self.divide = divide
+
+    @staticmethod
+    def _inside(score, low, high, closed):
+        lower = score >= low if closed in ('left', 'both') else score > low
+        upper = score <= high if closed in ('right', 'both') else score < high
+        return lower and upper
+
+    def encode(self, value):
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            return [self.invalid / self.divide]
+        for low, high, closed, result in self.bins:
+            if self._inside(score, low, high, closed):
+                return [result / self.divide]
+        return [self.default / self.divide]
+
+
+class FeatureSchema:
+    """필드 목록 → 벡터 레이아웃 (인코더 + 추천 이유 해석기)"""
+
+    def __init__(self, fields):
+        self.fields = [f.compile() for f in fields]
+        self.offsets = np.cumsum([0] + [f.width for f in self.fields])[:-1].tolist()
+        self.dim = sum(f.width for f in self.fields)
+        self.field_names = [f.name for f in self.fields]
+        self.column_decoders = [d for f in self.fields for d in f.decoders()]
+
+    # ===== 인코더 =====
+    def vectorize(self, pref):
+        """설문 하나(dict) → (dim,) 벡터. 필드가 빠져 있으면 KeyError"""
+        vector = []
+        for field in self.fields:
+            vector.extend(field.lookup(pref[field.name]))
+        return np.array(vector)
+
+    def vectorize_many(self, prefs):
+        """설문 여러 개(dict 목록 또는 DataFrame) → ((U, dim) 행렬, 필드가 다 있는 행 마스크)"""
+        if isinstance(prefs, pd.DataFrame):
+            frame = prefs.reindex(columns=self.field_names)
+            valid = frame.notna().all(axis=1).to_numpy()
+        else:
+            prefs = list(prefs)
+            valid = np.array([all(name in p for name in self.field_names) for p in prefs], dtype=bool)
+            frame = pd.DataFrame.from_records(prefs, columns=self.field_names)
+
+        matrix = np.zeros((len(frame), self.dim))
+        for field, offset in zip(self.fields, self.offsets):
+            # 열마다 고유값만 룩업 → 행 번호로 펼치기
+            codes, uniques = pd.factorize(frame[field.name].to_numpy(dtype=object), use_na_sentinel=False)
+            table = np.array([field.lookup(u) for u in uniques], dtype=float).reshape(len(uniques), field.width)
+            matrix[:, offset:offset + field.width] = table[codes]
+        matrix[~valid] = 0.0
+        return matrix, valid
+
+    # ===== 추천 이유 해석 =====
+    def reason_label(self, index, value):
+        decoder = self.column_decoders[index] if 0 <= index < self.dim else None
+        return decoder.label(value) if decoder is not None else None
+
+    def reason_codes(self, matrix):
+        """(N, dim) 강의 벡터 → (N, dim) 추천 이유 코드 행렬(-1은 이유 없음)과 코드별 라벨 목록.
+        열마다 고유값만 해석해서 행 수가 많아도 빠르다."""
+        labels = []
+        label_ids = {}
+        codes = np.full(matrix.shape, -1, dtype=np.int16)
+        for j in range(matrix.shape[1]):
+            # 번들 벡터는 float32라서 0.2 같은 값 비교를 위해 반올림
+            column = np.round(np.asarray(matrix[:, j], dtype=float), 6)
+            uniques, inverse = np.unique(column, return_inverse=True)
+            lookup = np.full(len(uniques), -1, dtype=np.int16)
+            for u, value in enumerate(uniques):
+                label = self.reason_label(j, value)
+                if label is not None:
+                    if label not in label_ids:
+                        label_ids[label] = len(labels)
+                        labels.append(label)
+                    lookup[u] = label_ids[label]
+            codes[:, j] = lookup[inverse]
+        return codes, labels
+
+
+# ===== 상위 3개 추천 이유 (k개 강의 한 번에) =====
+def top_3_reasons(user_vec, lecture_rows, code_rows, labels):
+    """lecture_rows: (k, F) 강의 벡터, code_rows: (k, F) 이유 코드 → 강의별 이유 3개 목록"""
+    if len(lecture_rows) == 0:
+        return []
+    values = np.round(np.asarray(lecture_rows, dtype=float), 6)
+    contributions = user_vec.reshape(1, -1) * values
+    order = np.argsort(contributions, axis=1)[:, ::-1]          # 기여도 큰 순서
+    codes = np.take_along_axis(code_rows, order, axis=1)
+
+    # 앞에서 이미 나온 이유(같은 코드)는 중복으로 제외
+    n_features = codes.shape[1]
+    earlier = np.tril(np.ones((n_features, n_features), dtype=bool), -1)
+    duplicate = ((codes[:, :, None] == codes[:, None, :]) & earlier).any(axis=2)
+    valid = (codes >= 0) & ~duplicate
+    chosen = valid & (np.cumsum(valid, axis=1) <= 3)
+
+    return [[labels[c] for c in row_codes[row_chosen]] for row_codes, row_chosen in zip(codes, chosen)]
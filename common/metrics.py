@@ -0,0 +1,85 @@
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, ProcessCollector, generate_latest
+
+# ===== 단계별 소요 시간 (Prometheus) =====
+# 모든 서비스가 공용 패키지에서 불러옴: from common.metrics import timed
+# 단계 이름: firestore_read, firestore_write, catalog_load, vectorize, similarity, explain,
+#            crawl_request, selenium_page_load, selenium_parse
+# 레지스트리는 모듈마다 따로 — 같은 프로세스에서 모듈을 다시 불러와도 이름 충돌 없음
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+# 벡터화(수십 µs) ~ Selenium 페이지 로드(수십 초)까지
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+           0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_SECONDS = Histogram(
+    "stage_duration_seconds", "단계별 소요 시간(초)", ["stage"], buckets=BUCKETS, registry=REGISTRY
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간(초)", ["method", "route", "status"],
+    buckets=BUCKETS, registry=REGISTRY
+)
+
+
+@contextmanager
+def timed(stage):
+    """with timed("similarity"): ... 또는 @timed("firestore_read") 데코레이터로 사용"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def install_metrics(app):
+    """FastAPI 앱에 /metrics 엔드포인트 + 요청 시간 측정 미들웨어 추가"""
+    from fastapi import Response
+
+    @app.middleware("http")
+    async def record_request_time(request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # 경로 변수별로 라벨이 늘어나지 않게 라우트 템플릿으로 기록
+            route = request.scope.get("route")
+            REQUEST_SECONDS.labels(request.method, getattr(route, "path", "unmatched"), str(status)) \
+                .observe(time.perf_counter() - start)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+    return app
+
+
+# ===== 샘플링 디버그 로그 =====
+# DEBUG_LOG_SAMPLE_RATE (0~1, 기본 0 = 끔) 비율의 요청만 JSON 한 줄로 출력.
+# 꺼져 있으면 비교 한 번으로 끝나므로, 만드는 데 비싼 값은 호출 전에 debug_sampled()로 확인할 것
+DEBUG_LOG_SAMPLE_RATE = float(os.getenv("DEBUG_LOG_SAMPLE_RATE", "0"))
+
+
+def debug_sampled():
+    return DEBUG_LOG_SAMPLE_RATE > 0 and random.random() < DEBUG_LOG_SAMPLE_RATE
+
+
+def _jsonable(value):
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def debug_log(event, **fields):
+    """샘플링된 요청만 출력. 값 변환(json)은 출력할 때만 하므로 꺼져 있으면 거의 비용 없음"""
+    if not debug_sampled():
+        return
+    print("[DEBUG] " + json.dumps(dict(event=event, **fields), ensure_ascii=False, default=_jsonable))
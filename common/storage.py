@@ -0,0 +1,317 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime
+
+# ===== 저장소 백엔드 =====
+# STORAGE_BACKEND
+#   firestore (기본): firebase_admin으로 실제 Firestore 접속
+#   memory: 프로세스 메모리 (로컬 실행/부하 테스트용, 재시작하면 사라짐)
+#   sqlite: STORAGE_SQLITE_PATH 파일 (워커 여러 개가 같은 데이터를 공유, 네트워크 지연 없음)
+# 서비스 코드는 Firestore 클라이언트 API 중 collection/document/get/set/update/delete/stream/get_all/batch와
+# 컬렉션 쿼리의 select/limit/start_after(문서 id 순 페이지 나누기)만 쓰므로
+# memory/sqlite 백엔드는 그 부분을 같은 모양으로 구현한다.
+# 모든 서비스가 공용 패키지에서 불러옴: from common.storage import get_storage
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore")
+STORAGE_SQLITE_PATH = os.getenv("STORAGE_SQLITE_PATH", "storage.sqlite3")
+SQLITE_TIMEOUT_SECONDS = 30
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class DocumentNotFound(KeyError):
+    """update() 대상 문서가 없음 (Firestore의 NotFound에 해당)"""
+
+
+# ===== Firestore API 모양의 참조/스냅샷 (memory, sqlite 공용) =====
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class DocumentReference:
+    def __init__(self, store, path):
+        self._store = store
+        self.path = path                        # ('users', uid, 'results', doc_id)
+        self.id = path[-1]
+
+    def collection(self, name):
+        return CollectionReference(self._store, self.path + (name,))
+
+    def get(self):
+        return DocumentSnapshot(self, self._store.get(self.path))
+
+    def set(self, data, merge=False):
+        self._store.apply([('set', self.path, data, merge)])
+
+    def update(self, data):
+        self._store.apply([('update', self.path, data, False)])
+
+    def delete(self):
+        self._store.apply([('delete', self.path, None, False)])
+
+
+class CollectionReference:
+    def __init__(self, store, path):
+        self._store = store
+        self.path = path
+        self.id = path[-1]
+
+    def document(self, doc_id=None):
+        # Firestore처럼 id를 안 주면 임의 id
+        return DocumentReference(self._store, self.path + (doc_id or uuid.uuid4().hex,))
+
+    def stream(self):
+        for doc_id, data in self._store.children(self.path):
+            yield DocumentSnapshot(DocumentReference(self._store, self.path + (doc_id,)), data)
+
+    def select(self, field_paths):
+        return Query(self._store, self.path).select(field_paths)
+
+    def limit(self, count):
+        return Query(self._store, self.path).limit(count)
+
+    def start_after(self, snapshot):
+        return Query(self._store, self.path).start_after(snapshot)
+
+
+class Query:
+    """컬렉션 쿼리 (Firestore처럼 커서를 쓰면 문서 id 순)"""
+
+    def __init__(self, store, path, fields=None, count=None, after=None):
+        self._store = store
+        self.path = path
+        self._fields = fields
+        self._count = count
+        self._after = after
+
+    def _copy(self, **changes):
+        state = dict(fields=self._fields, count=self._count, after=self._after)
+        state.update(changes)
+        return Query(self._store, self.path, **state)
+
+    def select(self, field_paths):
+        return self._copy(fields=list(field_paths))
+
+    def limit(self, count):
+        return self._copy(count=count)
+
+    def start_after(self, snapshot):
+        return self._copy(after=snapshot.id)
+
+    def stream(self):
+        children = sorted(self._store.children(self.path), key=lambda item: item[0])
+        if self._after is not None:
+            children = [item for item in children if item[0] > self._after]
+        if self._count is not None:
+            children = children[:self._count]
+        for doc_id, data in children:
+            if self._fields is not None:
+                data = {field: data[field] for field in self._fields if field in data}
+            yield DocumentSnapshot(DocumentReference(self._store, self.path + (doc_id,)), data)
+
+
+class WriteBatch:
+    def __init__(self, store):
+        self._store = store
+        self._ops = []
+
+    def set(self, reference, data, merge=False):
+        self._ops.append(('set', reference.path, data, merge))
+
+    def update(self, reference, data):
+        self._ops.append(('update', reference.path, data, False))
+
+    def delete(self, reference):
+        self._ops.append(('delete', reference.path, None, False))
+
+    def commit(self):
+        # 배치 안의 쓰기는 한 번에 반영 (memory: 잠금 하나, sqlite: 트랜잭션 하나)
+        ops, self._ops = self._ops, []
+        self._store.apply(ops)
+
+
+class Client:
+    def __init__(self, store):
+        self.store = store
+
+    def collection(self, name):
+        return CollectionReference(self.store, (name,))
+
+    def document(self, path):
+        return DocumentReference(self.store, tuple(path.split('/')))
+
+    def get_all(self, references):
+        for reference in references:
+            yield reference.get()
+
+    def batch(self):
+        return WriteBatch(self.store)
+
+
+# ===== 쓰기 연산 → 새 문서 데이터 =====
+def _deep_merge(target, data):
+    # set(merge=True): 중첩 맵은 필드 단위로 합침
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+
+def _apply_update(target, data):
+    # update(): 'a.b' 필드 경로는 중첩 맵 안의 값만 바꿈
+    for field_path, value in data.items():
+        *parents, leaf = field_path.split('.')
+        node = target
+        for name in parents:
+            if not isinstance(node.get(name), dict):
+                node[name] = {}
+            node = node[name]
+        node[leaf] = copy.deepcopy(value)
+    return target
+
+
+def apply_write(current, op, path, data, merge):
+    """문서 하나에 쓰기 연산 적용 → 새 데이터 (삭제면 None)"""
+    if op == 'delete':
+        return None
+    if op == 'set':
+        if merge and current is not None:
+            return _deep_merge(copy.deepcopy(current), data)
+        return copy.deepcopy(data)
+    if current is None:
+        raise DocumentNotFound(f"문서가 없습니다: {'/'.join(path)}")
+    return _apply_update(copy.deepcopy(current), data)
+
+
+# ===== memory 백엔드 =====
+class MemoryStore:
+    def __init__(self):
+        self.collections = {}                   # {컬렉션 경로: {문서 id: dict}}
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        with self.lock:
+            return self.collections.get(path[:-1], {}).get(path[-1])
+
+    def children(self, path):
+        with self.lock:
+            return list(self.collections.get(path, {}).items())
+
+    def apply(self, ops):
+        with self.lock:
+            for op, path, data, merge in ops:
+                docs = self.collections.setdefault(path[:-1], {})
+                updated = apply_write(docs.get(path[-1]), op, path, data, merge)
+                if updated is None:
+                    docs.pop(path[-1], None)
+                else:
+                    docs[path[-1]] = updated
+
+
+# ===== sqlite 백엔드 =====
+def _encode(value):
+    # Firestore에 들어가는 값 중 JSON에 없는 것 (날짜는 ISO 문자열로 저장)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class SQLiteStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS documents ("
+                         "collection TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL, "
+                         "PRIMARY KEY (collection, id))")
+
+    def _connection(self):
+        # 스레드마다 연결 하나 (sqlite 연결은 스레드 간 공유 불가)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(path):
+        return '/'.join(path[:-1]), path[-1]
+
+    def get(self, path):
+        row = self._connection().execute(
+            "SELECT data FROM documents WHERE collection = ? AND id = ?", self._key(path)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def children(self, path):
+        rows = self._connection().execute(
+            "SELECT id, data FROM documents WHERE collection = ? ORDER BY rowid", ('/'.join(path),)
+        ).fetchall()
+        return [(doc_id, json.loads(data)) for doc_id, data in rows]
+
+    def apply(self, ops):
+        conn = self._connection()
+        # 읽고-고치고-쓰기를 다른 워커와 겹치지 않게 쓰기 잠금부터
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for op, path, data, merge in ops:
+                updated = apply_write(self.get(path), op, path, data, merge)
+                if updated is None:
+                    conn.execute("DELETE FROM documents WHERE collection = ? AND id = ?", self._key(path))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO documents (collection, id, data) VALUES (?, ?, ?)",
+                        self._key(path) + (json.dumps(updated, ensure_ascii=False, default=_encode),)
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+# ===== firestore 백엔드 =====
+def firestore_client(credentials_path):
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(credentials.Certificate(credentials_path))
+    return firestore.client()
+
+
+def open_storage(backend, credentials_path=None):
+    if backend == "firestore":
+        return firestore_client(credentials_path)
+    if backend == "memory":
+        return Client(MemoryStore())
+    if backend == "sqlite":
+        return Client(SQLiteStore(STORAGE_SQLITE_PATH))
+    raise ValueError(f"알 수 없는 STORAGE_BACKEND: {backend} (firestore | memory | sqlite)")
+
+
+def get_storage(credentials_path=None):
+    """프로세스 공용 클라이언트 (처음 부를 때 STORAGE_BACKEND로 생성)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = open_storage(STORAGE_BACKEND, credentials_path)
+            if STORAGE_BACKEND != "firestore":
+                print(f"[BOOT] 저장소 백엔드: {STORAGE_BACKEND}")
+        return _client
@@ -0,0 +1,99 @@
+import threading
+
+from common.write_behind import WriteBehindQueue, WRITE_MAX_ATTEMPTS
+
+
+class InvalidDocument(ValueError):
+    pass
+
+
+class FakeReference:
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.path = ("docs", doc_id)
+
+    def set(self, data, merge=False):
+        self.store.commit([(self, data)])
+
+
+class FakeBatch:
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def set(self, reference, data, merge=False):
+        self.ops.append((reference, data))
+
+    def commit(self):
+        self.store.commit(self.ops)
+
+
+class FakeStore:
+    """배치는 원자적: 문서 하나라도 bad 값이 있으면 배치 전체가 실패"""
+
+    def __init__(self):
+        self.docs = {}
+        self.commits = 0
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def document(self, doc_id):
+        return FakeReference(self, doc_id)
+
+    def commit(self, ops):
+        self.commits += 1
+        if any(data.get("bad") for _, data in ops):
+            raise InvalidDocument("invalid value")
+        for reference, data in ops:
+            self.docs[reference.path] = data
+
+
+def test_one_bad_document_does_not_fail_the_batch():
+    store = FakeStore()
+    queue = WriteBehindQueue(store, enabled=True)
+    for i in range(5):
+        queue.set(store.document(f"ok{i}"), {"value": i})
+    queue.set(store.document("broken"), {"bad": True})
+
+    for _ in range(WRITE_MAX_ATTEMPTS):
+        queue.flush()
+
+    stats = queue.stats()
+    assert stats["written"] == 5
+    assert stats["dropped"] == 1
+    assert stats["pending"] == 0
+    assert sorted(path[1] for path in store.docs) == [f"ok{i}" for i in range(5)]
+
+
+def test_waiters_only_see_their_own_failure():
+    store = FakeStore()
+    queue = WriteBehindQueue(store, interval=60, enabled=True)
+    errors = {}
+
+    def save(doc_id, data):
+        try:
+            queue.set(store.document(doc_id), data, wait=True)
+        except Exception as e:
+            errors[doc_id] = e
+
+    threads = [threading.Thread(target=save, args=(f"ok{i}", {"value": i})) for i in range(3)]
+    threads.append(threading.Thread(target=save, args=("broken", {"bad": True})))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    queue.stop()
+
+    assert list(errors) == ["broken"]
+    assert isinstance(errors["broken"], InvalidDocument)
+    assert len(store.docs) == 3
+
+
+def test_wait_is_bounded_by_timeout():
+    store = FakeStore()
+    queue = WriteBehindQueue(store, enabled=True)
+    queue.start = lambda: None              # flush 스레드가 멈춘 상황
+    queue.set(store.document("slow"), {"value": 1}, wait=True, timeout=0.05)
+    assert queue.stats()["pending"] == 1
+    assert queue.flush() == 1
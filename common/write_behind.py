@@ -0,0 +1,223 @@
+import contextlib
+import copy
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+# ===== 쓰기 모아 보내기 (write-behind) =====
+# 쓰기를 바로 set 하지 않고 큐에 넣었다가
+# WRITE_FLUSH_INTERVAL초마다, 또는 WRITE_FLUSH_SIZE개가 쌓이면 배치 쓰기(최대 500개)로 한 번에 보낸다.
+# 같은 문서에 여러 번 쓰면 마지막 것만 남는다 (merge 쓰기는 필드 단위로 합침).
+# 서비스 엔드포인트는 응답 본문에 저장할 결과를 그대로 담으므로 기다리지 않는다.
+# 커밋을 꼭 확인해야 하는 호출만 set(..., wait=True)로 골라 쓴다:
+# flush를 바로 깨우고 커밋될 때까지 최대 WRITE_WAIT_TIMEOUT초 기다린다 (그동안 다른 요청이 넣은 쓰기도 같은 배치로 묶임).
+# 배치 커밋이 실패하면 그 배치를 문서 하나씩 다시 써서, 실제로 실패한 문서만 재시도/포기한다.
+# 기다리는 요청이 있는 문서가 실패하면 다음 주기를 기다리지 않고 바로 다시 시도한다.
+# 종료 시 stop()이 남은 쓰기를 모두 보낸다. WRITE_BEHIND=0이면 큐 없이 바로 쓴다.
+# 모든 서비스가 공용 패키지에서 불러옴: from common.write_behind import WriteBehindQueue
+WRITE_BEHIND = os.getenv("WRITE_BEHIND", "1") != "0"
+WRITE_FLUSH_INTERVAL = float(os.getenv("WRITE_FLUSH_INTERVAL", "0.5"))
+WRITE_FLUSH_SIZE = int(os.getenv("WRITE_FLUSH_SIZE", "500"))
+BATCH_WRITE_LIMIT = 500         # Firestore 배치 쓰기 최대 연산 수
+WRITE_MAX_ATTEMPTS = 3          # 문서 쓰기 실패 시 다음 flush에서 다시 시도할 횟수
+WRITE_WAIT_TIMEOUT = float(os.getenv("WRITE_WAIT_TIMEOUT", "5"))  # wait=True 쓰기를 기다리는 최대 시간(초)
+
+
+def _merge_fields(target, data):
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge_fields(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+class WriteBehindQueue:
+    def __init__(self, client, timer=None, interval=WRITE_FLUSH_INTERVAL, max_pending=WRITE_FLUSH_SIZE,
+                 enabled=WRITE_BEHIND):
+        self.client = client
+        # timer: 서비스의 metrics.timed (배치 쓰기 시간을 firestore_write 단계로 기록)
+        self.timer = timer or (lambda stage: contextlib.nullcontext())
+        self.interval = interval
+        self.max_pending = max(1, max_pending)
+        self.enabled = enabled
+        self._pending = OrderedDict()           # 문서 경로 → [참조, 데이터, merge, 시도 횟수, 기다리는 Future들]
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.enqueued = 0
+        self.coalesced = 0
+        self.written = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.dropped = 0
+
+    def set(self, reference, data, merge=False, wait=False, timeout=WRITE_WAIT_TIMEOUT):
+        """문서 쓰기 예약 (WRITE_BEHIND=0이면 바로 쓰기).
+        wait=True면 커밋될 때까지 최대 timeout초 기다림 (끝내 실패하면 그 예외를 다시 던짐,
+        시간이 지나면 경고만 남기고 돌아감 — 쓰기는 큐에 남아 계속 시도됨)"""
+        if not self.enabled:
+            with self.timer("firestore_write"):
+                reference.set(data, merge=merge)
+            return
+        data = copy.deepcopy(data)
+        done = Future() if wait else None
+        with self._lock:
+            self.enqueued += 1
+            entry = self._pending.get(reference.path)
+            if entry is None:
+                entry = self._pending[reference.path] = [reference, data, merge, 0, []]
+            else:
+                self.coalesced += 1
+                if merge:
+                    # 앞의 쓰기 위에 필드만 덮어씀 (앞이 merge가 아니면 결과도 통째 쓰기)
+                    _merge_fields(entry[1], data)
+                else:
+                    entry[1], entry[2] = data, False
+                entry[3] = 0
+            if done is not None:
+                entry[4].append(done)
+            full = len(self._pending) >= self.max_pending
+        self.start()
+        if full or wait:
+            self._wake.set()
+        if done is not None:
+            try:
+                done.result(timeout)
+            except FutureTimeout:
+                print(f"[WARN] 쓰기 대기 시간 초과 ({timeout}초, 큐에서 계속 시도): {reference.path}")
+
+    def flush(self):
+        """지금까지 쌓인 쓰기를 배치로 보냄 → 보낸 문서 수"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, OrderedDict()
+            entries = list(pending.items())
+            written = 0
+            for start in range(0, len(entries), BATCH_WRITE_LIMIT):
+                chunk = entries[start:start + BATCH_WRITE_LIMIT]
+                try:
+                    with self.timer("firestore_write"):
+                        batch = self.client.batch()
+                        for _, (reference, data, merge, _, _) in chunk:
+                            batch.set(reference, data, merge=merge)
+                        batch.commit()
+                except Exception as e:
+                    with self._lock:
+                        self.failed_batches += 1
+                    print(f"[WARN] 배치 쓰기 실패 ({len(chunk)}개 문서), 문서별로 다시 씀: {e}")
+                    written += self._write_each(chunk)
+                    continue
+                with self._lock:
+                    self.batches += 1
+                written += len(chunk)
+                self._resolve(chunk)
+            with self._lock:
+                self.written += written
+            return written
+
+    def _write_each(self, chunk):
+        """배치가 실패한 문서들을 하나씩 씀 → 쓴 문서 수 (실패한 문서만 재시도 큐로)"""
+        succeeded, failed = [], []
+        for path, entry in chunk:
+            reference, data, merge = entry[0], entry[1], entry[2]
+            try:
+                with self.timer("firestore_write"):
+                    reference.set(data, merge=merge)
+            except Exception as e:
+                print(f"[WARN] 문서 쓰기 실패: {path}: {e}")
+                failed.append((path, entry, e))
+                continue
+            succeeded.append((path, entry))
+        self._resolve(succeeded)
+        if failed:
+            self._requeue(failed)
+        return len(succeeded)
+
+    @staticmethod
+    def _resolve(chunk):
+        for _, entry in chunk:
+            for done in entry[4]:
+                done.set_result(None)
+
+    def _requeue(self, failed):
+        retry_now = False
+        with self._lock:
+            for path, entry, error in failed:
+                entry[3] += 1
+                newer = self._pending.get(path)
+                if entry[3] >= WRITE_MAX_ATTEMPTS:
+                    self.dropped += 1
+                    print(f"[ERROR] 쓰기 포기: {path}")
+                    for done in entry[4]:
+                        done.set_exception(error)
+                    continue
+                retry_now = retry_now or bool(entry[4])
+                if newer is None:
+                    self._pending[path] = entry
+                    continue
+                # 그 사이 같은 문서에 새 쓰기가 들어왔으면 실패한 쓰기 위에 새 쓰기를 얹음
+                # (새 쓰기가 merge가 아니면 어차피 통째로 덮으므로 새 것만)
+                if newer[2]:
+                    newer[1] = _merge_fields(entry[1], newer[1])
+                    newer[2] = entry[2]
+                    newer[3] = entry[3]
+                newer[4] = entry[4] + newer[4]
+        if retry_now:
+            # 응답을 기다리는 요청이 있으면 다음 주기까지 미루지 않고 바로 다시 flush
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self):
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """flush 스레드를 멈추고 남은 쓰기를 모두 보냄 (서버 종료 시)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for _ in range(WRITE_MAX_ATTEMPTS):
+            self.flush()
+            with self._lock:
+                if not self._pending:
+                    break
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+            self.dropped += len(pending)
+        for path, entry in pending.items():
+            print(f"[ERROR] 쓰기 포기: {path}")
+            for done in entry[4]:
+                done.set_exception(RuntimeError(f"종료 전에 쓰지 못했습니다: {path}"))
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "enabled": self.enabled,
+            "pending": pending,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "dropped": self.dropped,
+            "flush_interval_seconds": self.interval,
+            "flush_size": self.max_pending
+        }
@@ -1,27 +1,46 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from utils.crawling import crawl_schedule
+from utils.crawling import crawl_schedule, driver_pool
+from utils.driver_pool import DriverPoolTimeout
+from common.metrics import debug_log, install_metrics
 
 app = FastAPI()
+install_metrics(app)
 
 @app.get("/")
 def read_root():
     return {"message": "Crawling server is running 🐍"}
 
+# 브라우저는 서버 시작 때 미리 띄워 두고, 종료 때 모두 정리
+@app.on_event("startup")
+def start_driver_pool():
+    driver_pool.start()
+
+@app.on_event("shutdown")
+def stop_driver_pool():
+    driver_pool.stop()
+
+@app.get("/admin/drivers")
+def driver_pool_status():
+    return driver_pool.stats()
+
 class URLRequest(BaseModel):
     url: str
 
 @app.post("/crawl")
 def crawl_courses(request: URLRequest):
     try:
-        print("📥 요청 URL:", request.url)
         raw_result = crawl_schedule(request.url)
-        print("✅ 크롤링 결과:", raw_result)
+        debug_log("crawl", url=request.url, courses=raw_result)
 
         # 🔁 튜플 → dict 변환
         result = [{"과목명": name, "교수명": prof} for name, prof in raw_result]
 
         return {"courses": result}
+    except DriverPoolTimeout as e:
+        # 브라우저가 모두 사용 중 → 잠시 후 다시 시도하도록
+        raise HTTPException(status_code=503, detail=f"크롤링 서버가 바쁩니다. 잠시 후 다시 시도해 주세요. ({e})",
+                            headers={"Retry-After": "5"})
     except Exception as e:
         print("❌ 크롤링 오류:", e)
         return {"detail": f"크롤링 중 오류: {e}"}
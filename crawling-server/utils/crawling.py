@@ -7,6 +7,8 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from common.metrics import timed
+from utils.driver_pool import DriverPoolTimeout, WebDriverPool
 
 def get_webdriver():
     chrome_options = Options()
@@ -25,25 +27,34 @@ def get_webdriver():
     )
 
 
+# 미리 띄워 둔 드라이버 풀 (main의 startup/shutdown에서 시작/정리, utils/driver_pool.py)
+driver_pool = WebDriverPool(get_webdriver)
+
+
 def crawl_schedule(url: str):
     try:
-        driver = get_webdriver()
-        driver.get(url)
-
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "tablebody")))
-        tablebody = driver.find_element(By.CLASS_NAME, "tablebody")
-        subjects = tablebody.find_elements(By.CLASS_NAME, "subject")
-
-        course_set = set()
-        for subject in subjects:
-            try:
-                lecture = subject.find_element(By.TAG_NAME, "h3").text.strip()
-                professor = subject.find_element(By.TAG_NAME, "em").text.strip()
-                course_set.add((lecture, professor))
-            except:
-                continue
-        driver.quit()
+        # 드라이버는 with 블록을 벗어나면 오류가 나도 항상 풀로 반납 (오류가 났던 드라이버는 새로 교체)
+        with driver_pool.driver() as driver:
+            with timed("selenium_page_load"):
+                driver.get(url)
+                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "tablebody")))
+
+            with timed("selenium_parse"):
+                tablebody = driver.find_element(By.CLASS_NAME, "tablebody")
+                subjects = tablebody.find_elements(By.CLASS_NAME, "subject")
+
+                course_set = set()
+                for subject in subjects:
+                    try:
+                        lecture = subject.find_element(By.TAG_NAME, "h3").text.strip()
+                        professor = subject.find_element(By.TAG_NAME, "em").text.strip()
+                        course_set.add((lecture, professor))
+                    except:
+                        continue
         return list(course_set)
+    except DriverPoolTimeout:
+        # 풀이 꽉 찬 것은 크롤링 실패(빈 결과)가 아니라 과부하 → main에서 503으로
+        raise
     except Exception as e:
         print("크롤링 오류:", e)
         return []
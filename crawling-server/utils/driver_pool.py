@@ -0,0 +1,219 @@
+# utils/driver_pool.py
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# ===== Chromium WebDriver 풀 =====
+# 요청마다 브라우저를 새로 띄우면 시작에 몇 초, 메모리 수백 MB가 들기 때문에
+# 미리 띄워 둔 드라이버를 빌려 쓰고 돌려준다.
+#  - 동시에 쓸 수 있는 드라이버는 WEBDRIVER_POOL_SIZE개, 나머지 요청은 WEBDRIVER_ACQUIRE_TIMEOUT초까지 줄 서서 기다림
+#    (자리를 얻은 뒤 띄우는 중인 드라이버를 기다리는 시간도 같은 제한 안에서)
+#  - 빌려줄 때 살아 있는지 확인하고, 죽었으면 버리고 새로 띄움
+#  - WEBDRIVER_MAX_USES번 쓴 드라이버나 사용 중 오류가 난 드라이버는 quit 하고 백그라운드에서 새로 채움
+#  - 오류가 나도 with 블록을 벗어나면 항상 반납/정리됨
+WEBDRIVER_POOL_SIZE = int(os.getenv("WEBDRIVER_POOL_SIZE", "2"))
+WEBDRIVER_MAX_USES = int(os.getenv("WEBDRIVER_MAX_USES", "50"))
+WEBDRIVER_ACQUIRE_TIMEOUT = float(os.getenv("WEBDRIVER_ACQUIRE_TIMEOUT", "30"))
+
+
+class DriverPoolTimeout(RuntimeError):
+    """WEBDRIVER_ACQUIRE_TIMEOUT초 안에 드라이버를 빌리지 못함"""
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+
+class WebDriverPool:
+    def __init__(self, factory, size=WEBDRIVER_POOL_SIZE, max_uses=WEBDRIVER_MAX_USES,
+                 acquire_timeout=WEBDRIVER_ACQUIRE_TIMEOUT):
+        self.factory = factory                  # 드라이버를 새로 띄우는 함수 (get_webdriver)
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(self.size)     # 동시 사용 제한 (줄 서기)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)     # 드라이버가 반납/준비/실패되면 깨움
+        self._closed = False
+        # 띄우는 중인 드라이버 수 (백그라운드 채우기 + 빌릴 때 직접 띄우기).
+        # 대기 + 사용 중 + 띄우는 중이 size를 넘지 않도록 둘 다 같은 lock 아래에서 센다
+        self._starting = 0
+        self.launched = 0
+        self.recycled = 0
+        self.unhealthy = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.in_use = 0
+
+    # ----- 드라이버 띄우기/정리 -----
+    def _launch(self):
+        pooled = PooledDriver(self.factory())
+        with self._lock:
+            self.launched += 1
+        return pooled
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            print(f"[WARN] WebDriver 종료 실패: {e}")
+
+    @staticmethod
+    def _healthy(pooled):
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _refill(self):
+        """빈자리만큼 드라이버를 미리 띄워 둠 (백그라운드 스레드)"""
+        with self._lock:
+            missing = self.size - len(self._idle) - self.in_use - self._starting
+            if self._closed or missing <= 0:
+                return
+            self._starting += missing
+        for _ in range(missing):
+            try:
+                pooled = self._launch()
+            except Exception as e:
+                print(f"[WARN] WebDriver 미리 띄우기 실패: {e}")
+                with self._lock:
+                    self._starting -= 1
+                    self._changed.notify()      # 기다리던 요청이 직접 띄우도록
+                continue
+            with self._lock:
+                self._starting -= 1
+                closed = self._closed
+                if not closed:
+                    self._idle.append(pooled)
+                    self._changed.notify()
+            if closed:
+                self._quit(pooled)
+
+    def _refill_async(self):
+        threading.Thread(target=self._refill, name="webdriver-refill", daemon=True).start()
+
+    # ----- 빌리기/반납 -----
+    def _checkout(self, deadline):
+        while True:
+            pooled = None
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("WebDriver 풀이 종료되었습니다.")
+                    if self._idle:
+                        pooled = self._idle.popleft()
+                        self.in_use += 1
+                        break
+                    if len(self._idle) + self.in_use + self._starting < self.size:
+                        self._starting += 1     # 빈자리가 있으면 직접 띄움
+                        break
+                    # 빈자리가 없으면 띄우는 중인 드라이버가 준비될 때까지 기다림 (빌리기 제한 시간 안에서)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise DriverPoolTimeout(f"{self.acquire_timeout}초 안에 WebDriver를 빌리지 못했습니다.")
+                    self._changed.wait(remaining)
+            if pooled is None:
+                try:
+                    pooled = self._launch()
+                except Exception:
+                    with self._lock:
+                        self._starting -= 1
+                        self._changed.notify()
+                    raise
+                with self._lock:
+                    self._starting -= 1
+                    self.in_use += 1
+                return pooled
+            if self._healthy(pooled):
+                return pooled
+            with self._lock:
+                self.in_use -= 1
+                self.unhealthy += 1
+            self._quit(pooled)
+
+    def _checkin(self, pooled, ok):
+        pooled.uses += 1
+        keep = ok and pooled.uses < self.max_uses and not self._closed
+        if keep:
+            try:
+                # 다음 요청에 쿠키/페이지가 남지 않게
+                pooled.driver.delete_all_cookies()
+                pooled.driver.get("about:blank")
+            except Exception:
+                keep = False
+        with self._lock:
+            self.in_use -= 1
+            if keep:
+                self._idle.append(pooled)
+            else:
+                self.recycled += 1
+            self._changed.notify()
+        if not keep:
+            self._quit(pooled)
+            self._refill_async()
+
+    @contextmanager
+    def driver(self):
+        """with driver_pool.driver() as driver: ... (끝나면 항상 반납, 오류가 났으면 버리고 새로 띄움)"""
+        if self._closed:
+            raise RuntimeError("WebDriver 풀이 종료되었습니다.")
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._lock:
+            self.waiting += 1
+        acquired = self._slots.acquire(timeout=self.acquire_timeout)
+        with self._lock:
+            self.waiting -= 1
+            if not acquired:
+                self.timeouts += 1
+        if not acquired:
+            raise DriverPoolTimeout(f"{self.acquire_timeout}초 안에 WebDriver를 빌리지 못했습니다.")
+        try:
+            pooled = self._checkout(deadline)
+            ok = False
+            try:
+                yield pooled.driver
+                ok = True
+            finally:
+                self._checkin(pooled, ok)
+        finally:
+            self._slots.release()
+
+    # ----- 수명 -----
+    def start(self):
+        """서버 시작 시 드라이버를 미리 띄움 (시작을 막지 않게 백그라운드에서)"""
+        self._closed = False
+        self._refill_async()
+
+    def stop(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._changed.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "starting": self._starting,
+                "launched": self.launched,
+                "recycled": self.recycled,
+                "unhealthy": self.unhealthy,
+                "timeouts": self.timeouts,
+                "max_uses": self.max_uses
+            }
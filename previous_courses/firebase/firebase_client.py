@@ -1,17 +1,18 @@
 # firebase/firebase_client.py
 
-import firebase_admin
-from firebase_admin import credentials, firestore
 from datetime import datetime
+from common.storage import get_storage
+from common.write_behind import WriteBehindQueue
+from common.metrics import timed
 
-# Firebase 초기화 (이미 초기화된 경우 생략 방지)
-if not firebase_admin._apps:
-    cred = credentials.Certificate("/etc/secrets/firebase_key.json")  # Render 배포 시 Secret으로 처리됨
-    firebase_admin.initialize_app(cred)
+# Firebase 초기화 (STORAGE_BACKEND=memory/sqlite면 로컬 저장소, common/storage.py)
+db = get_storage("/etc/secrets/firebase_key.json")  # Render 배포 시 Secret으로 처리됨
 
-db = firestore.client()
+# 학점 요약 쓰기는 동시에 들어온 것끼리 배치로 (common/write_behind.py, main의 startup/shutdown에서 시작/정리)
+write_queue = WriteBehindQueue(db, timed)
 
 # 사용자의 schedule_links 전체 불러오기
+@timed("firestore_read")
 def fetch_schedule_links(user_id):
     user_doc = db.collection("users").document(user_id).get()
     if user_doc.exists:
@@ -19,6 +20,7 @@ def fetch_schedule_links(user_id):
     return {}
 
 # 학기별 강의 정보를 previous_courses 맵 필드로 저장
+@timed("firestore_write")
 def save_courses_by_semester(user_id, semester, courses):
     user_ref = db.collection("users").document(user_id)
     user_doc = user_ref.get()
@@ -47,6 +49,7 @@ def save_courses_by_semester(user_id, semester, courses):
         user_ref.update({"previous_courses": previous_data})
 
 
+@timed("firestore_write")
 def update_course_metadata_by_semester(user_id, semester, course_name, professor, category, credit):
     user_ref = db.collection("users").document(user_id)
     user_doc = user_ref.get()
@@ -75,6 +78,7 @@ def update_course_metadata_by_semester(user_id, semester, course_name, professor
 
 
 # 전체 강의 불러오기 (모든 학기의 course들 평탄화)
+@timed("firestore_read")
 def get_all_courses(user_id):
     user_ref = db.collection("users").document(user_id).get()
     if not user_ref.exists:
@@ -95,4 +99,5 @@ def save_credit_summary(user_id, summary):
     # timestamp 필드 추가
     summary["updated_at"] = datetime.utcnow()
     
-    summary_ref.set(summary)
+    # 쓰기 큐에 넣고 바로 돌아감 (응답 본문에 요약이 그대로 담김, 동시에 들어온 요약은 한 배치로)
+    write_queue.set(summary_ref, summary)
@@ -1,11 +1,23 @@
 from fastapi import FastAPI
 from router import courses
+from firebase.firebase_client import write_queue
+from common.metrics import install_metrics
 
 app = FastAPI()
+install_metrics(app)
 
 @app.get("/")
 def read_root():
     return {"message": "이전 수강 강의 API is running 🚀"}
 
+@app.on_event("startup")
+def start_write_queue():
+    write_queue.start()
+
+# 종료 전에 쌓여 있는 학점 요약 쓰기를 모두 보냄
+@app.on_event("shutdown")
+def stop_write_queue():
+    write_queue.stop()
+
 # 강의 저장 및 학점 계산 관련 라우터 등록
 app.include_router(courses.router)
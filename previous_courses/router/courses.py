@@ -4,6 +4,7 @@ from typing import List, Literal
 from firebase.firebase_client import save_courses_by_semester, update_course_metadata_by_semester, get_all_courses, save_credit_summary
 from utils.crawling import crawl_schedule
 from utils.credit_calc import compute_credit_ratios
+from common.metrics import debug_log
 
 router = APIRouter()
 
@@ -29,7 +30,7 @@ class UserID(BaseModel):
 def save_courses_from_url(request: CrawlRequest):
     try:
         courses = crawl_schedule(request.schedule_url)
-        print(f"✅ {request.semester} 학기 크롤링된 강의:", courses)
+        debug_log("previous_courses.crawled", user_id=request.user_id, semester=request.semester, courses=courses)
         
         save_courses_by_semester(request.user_id, request.semester, courses)
         return {"message": f"{request.semester}에 {len(courses)}개 강의를 저장했습니다.", "courses": courses}
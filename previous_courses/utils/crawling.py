@@ -1,9 +1,11 @@
 # utils/crawling.py
 import os
 import requests
+from common.metrics import timed
 
 CRAWLING_SERVER_URL = os.getenv("CRAWLING_SERVER_URL", "https://crawling-server.onrender.com/crawl")
 
+@timed("crawl_request")
 def crawl_schedule(schedule_url: str):
     try:
         response = requests.post(